@@ -0,0 +1,71 @@
+"""
+Compares attribute access, memory per object, and from_dict for the generated Python classes with properties, with
+properties and --use_slots, and with --direct-attributes.
+
+Usage: python benchmarks/bench_attributes.py
+"""
+
+import os
+import tempfile
+import timeit
+import tracemalloc
+
+from bench_from_dict import SCHEMA, MESSAGE
+from helpers import generate
+
+STYLES = {
+    "properties": dict(use_slots=False, direct_attributes=False),
+    "properties, --use_slots": dict(use_slots=True, direct_attributes=False),
+    "--direct-attributes": dict(use_slots=False, direct_attributes=True),
+}
+
+
+def per_call(f, runs: int = 200000) -> float:
+    return min(timeit.repeat(f, number=runs, repeat=5)) / runs * 1e9
+
+
+def memory(module, count: int = 100000) -> float:
+    tracemalloc.start()
+    customers = [
+        module.Customer(id=i, name="Someone", email="someone@example.com")
+        for i in range(count)
+    ]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del customers
+    return size / count
+
+
+def main():
+    print(
+        "{:<26} {:>8} {:>8} {:>12} {:>12}".format(
+            "", "read", "write", "bytes/object", "from_dict"
+        )
+    )
+    with tempfile.TemporaryDirectory() as d:
+        for i, (label, kwargs) in enumerate(STYLES.items()):
+            module = generate(
+                os.path.join(d, "model{}.py".format(i)),
+                SCHEMA,
+                use_types=True,
+                constructor_type_check=True,
+                **kwargs
+            )
+            customer = module.Customer(id=1, name="Someone")
+
+            def write():
+                customer.name = "Other"
+
+            print(
+                "{:<26} {:>6.1f}ns {:>6.1f}ns {:>12.0f} {:>10.2f}us".format(
+                    label,
+                    per_call(lambda: customer.name),
+                    per_call(write),
+                    memory(module),
+                    per_call(lambda: module.Order.from_dict(MESSAGE), 20000) / 1000,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
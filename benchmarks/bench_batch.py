@@ -0,0 +1,56 @@
+"""
+Measures generating many schemas from the command line: one process per schema, one --batch run, and --batch runs
+spread over several worker processes.
+
+Usage: python benchmarks/bench_batch.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from schemas import definitions_schema
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(*args):
+    subprocess.run(
+        [sys.executable, "-m", "jsonschema2popo", *args], check=True, cwd=REPO
+    )
+
+
+def main():
+    count = 4
+    with tempfile.TemporaryDirectory() as d:
+        manifest = []
+        for i in range(count):
+            schema = os.path.join(d, "{}.json".format(i))
+            with open(schema, "w") as f:
+                json.dump(definitions_schema(5), f)
+            manifest.append(
+                {"schema": schema, "output": os.path.join(d, "{}.py".format(i))}
+            )
+        with open(os.path.join(d, "manifest.json"), "w") as f:
+            json.dump(manifest, f)
+
+        start = time.perf_counter()
+        for entry in manifest:
+            run("-o", entry["output"], entry["schema"])
+        print("{} separate runs:  {:.2f}s".format(count, time.perf_counter() - start))
+
+        for jobs in sorted({1, 2, 4, os.cpu_count()}):
+            start = time.perf_counter()
+            run("--batch", os.path.join(d, "manifest.json"), "--jobs", str(jobs))
+            print(
+                "--batch --jobs {:<3}  {:.2f}s".format(
+                    jobs, time.perf_counter() - start
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Measures the generated Python from_dict and as_dict for a message with a large base64 field, decoded and encoded again
+by --json-methods, compared to --base64-bytes, which decodes it only when it is read and otherwise passes it through.
+Also measures setting the field to a memoryview of a larger buffer, compared to copying the slice into bytes first.
+
+Usage: python benchmarks/bench_bytes.py [size of the field in bytes, default 1000000]
+"""
+
+import base64
+import os
+import sys
+import tempfile
+
+from helpers import generate, report
+
+SCHEMA = {
+    "definitions": {
+        "Upload": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "content": {"type": "string", "media": {"binaryEncoding": "base64"}},
+            },
+        }
+    }
+}
+
+
+# Each call decodes or encodes the whole field, so it is slow enough to time a few runs
+RUNS = 20
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    content = os.urandom(size)
+    message = {"name": "upload.bin", "content": base64.b64encode(content).decode()}
+    with tempfile.TemporaryDirectory() as d:
+        for label, kwargs in (
+            ("--json-methods", {"json_methods": True}),
+            ("--base64-bytes", {"base64_bytes": True}),
+        ):
+            Upload = generate(
+                os.path.join(d, "model.py"),
+                SCHEMA,
+                use_types=True,
+                constructor_type_check=True,
+                **kwargs
+            ).Upload
+            report(
+                "{} from_dict, read name".format(label),
+                lambda: Upload.from_dict(message).name,
+                runs=RUNS,
+            )
+            report(
+                "{} from_dict, read content".format(label),
+                lambda: Upload.from_dict(message).content,
+                runs=RUNS,
+            )
+            report(
+                "{} from_dict, as_dict".format(label),
+                lambda: Upload.from_dict(message).as_dict(),
+                runs=RUNS,
+            )
+
+        buffer = bytearray(size * 2)
+        report(
+            "--base64-bytes set bytes copy of a slice",
+            lambda: Upload(
+                content=bytes(memoryview(buffer)[size // 2 : size + size // 2])
+            ),
+            runs=RUNS,
+        )
+        report(
+            "--base64-bytes set memoryview of a slice",
+            lambda: Upload(content=memoryview(buffer)[size // 2 : size + size // 2]),
+            runs=RUNS,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Measures decoding enum values by calling the enum class, as from_dict used to, against the generated lookup tables,
+and converting records with enums back to dicts with and without --enum-mixins.
+
+Usage: python benchmarks/bench_enum.py
+"""
+
+import os
+import tempfile
+
+from helpers import generate, report
+
+SCHEMA = {
+    "definitions": {
+        "Status": {"type": "string", "enum": ["OPEN", "PAID", "SHIPPED", "CLOSED"]},
+        "Priority": {"type": "integer", "enum": [1, 2, 3, 4, 5]},
+        "Event": {
+            "type": "object",
+            "properties": {
+                "status": {"$ref": "#/definitions/Status"},
+                "priority": {"$ref": "#/definitions/Priority"},
+                "history": {"type": "array", "items": {"$ref": "#/definitions/Status"}},
+            },
+        },
+    }
+}
+
+MESSAGE = {
+    "status": "PAID",
+    "priority": 3,
+    "history": ["OPEN", "PAID", "SHIPPED", "CLOSED"] * 4,
+}
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        module = generate(os.path.join(d, "plain.py"), SCHEMA)
+        history = MESSAGE["history"]
+        report(
+            "Status(value) for 16 values", lambda: [module.Status(v) for v in history]
+        )
+        report(
+            "lookup table for 16 values",
+            lambda: [module._Status_members.member(v) for v in history],
+        )
+        report("from_dict", lambda: module.Event.from_dict(MESSAGE))
+        event = module.Event.from_dict(MESSAGE)
+        report("as_dict", event.as_dict)
+
+        mixins = generate(os.path.join(d, "mixins.py"), SCHEMA, enum_mixins=True)
+        event = mixins.Event.from_dict(MESSAGE)
+        report("from_dict with --enum-mixins", lambda: mixins.Event.from_dict(MESSAGE))
+        report("as_dict with --enum-mixins", event.as_dict)
+
+
+if __name__ == "__main__":
+    main()
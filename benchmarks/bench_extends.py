@@ -0,0 +1,52 @@
+"""
+Measures processing schemas where many definitions extend the same external file, within one schema and across
+several schemas processed by the same loader as --batch does.
+
+Usage: python benchmarks/bench_extends.py
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from schemas import definitions_schema
+
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+
+
+def main():
+    count = 50
+    with tempfile.TemporaryDirectory() as d:
+        base = os.path.join(d, "base.json")
+        with open(base, "w") as f:
+            json.dump(dict(definitions_schema(200), title="#/definitions/Def0"), f)
+        schema = {
+            "definitions": {
+                "Type{}".format(i): {"type": "object", "extends": {"$ref": base}}
+                for i in range(count)
+            }
+        }
+
+        loader = JsonSchema2Popo(language="python")
+        start = time.perf_counter()
+        loader.process(schema)
+        print(
+            "{} definitions extending one file: {:.3f}s".format(
+                count, time.perf_counter() - start
+            )
+        )
+
+        start = time.perf_counter()
+        for _ in range(10):
+            loader.reset()
+            loader.process(schema)
+        print(
+            "10 more schemas with the same loader: {:.3f}s".format(
+                time.perf_counter() - start
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures formatting generated code: Go files formatted with one `go fmt` process per file versus one gofmt process for
+the whole batch, and JavaScript formatted through a file round trip versus in memory.
+
+Usage: python benchmarks/bench_format.py
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+from schemas import definitions_schema
+
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+from jsonschema2popo.go.go import Go
+from jsonschema2popo.js.js import JS
+
+
+def render(language, **args):
+    loader = JsonSchema2Popo(language=language)
+    loader.update_args(argparse.Namespace(**args))
+    loader.process(definitions_schema(20))
+    template = loader.jinja.get_template(loader.module.template())
+    return template.render(
+        models=loader.definitions,
+        enum_used=loader.enum_used,
+        list_used=loader.list_used,
+        **loader.module.extra_jinja_inputs()
+    )
+
+
+def main():
+    count = 20
+    go_code = render("go", package_name="generated")
+    js_code = render("js", constructor_type_check=True, namespace_path=None)
+    with tempfile.TemporaryDirectory() as d:
+        go_files = [os.path.join(d, "{}.go".format(i)) for i in range(count)]
+
+        for f in go_files:
+            with open(f, "w") as fw:
+                fw.write(go_code)
+        start = time.perf_counter()
+        for f in go_files:
+            subprocess.run(["go", "fmt", f], check=True, stdout=subprocess.DEVNULL)
+        print("go fmt per file:     {:.3f}s".format(time.perf_counter() - start))
+
+        for f in go_files:
+            with open(f, "w") as fw:
+                fw.write(go_code)
+        start = time.perf_counter()
+        Go.format_go_files(go_files)
+        print("gofmt per batch:     {:.3f}s".format(time.perf_counter() - start))
+
+        js_file = os.path.join(d, "model.js")
+        start = time.perf_counter()
+        for _ in range(3):
+            with open(js_file, "w") as fw:
+                fw.write(js_code)
+            JS.format_js_file(js_file)
+        print("js file round trip:  {:.3f}s".format(time.perf_counter() - start))
+
+        start = time.perf_counter()
+        for _ in range(3):
+            with open(js_file, "w") as fw:
+                fw.write(JS.format_js_code(js_code))
+        print("js in memory:        {:.3f}s".format(time.perf_counter() - start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Measures decoding messages with the generated Python from_dict, with and without constructor type checks.
+
+Usage: python benchmarks/bench_from_dict.py
+"""
+
+import os
+import tempfile
+
+from helpers import generate, report
+
+SCHEMA = {
+    "definitions": {
+        "Status": {"type": "string", "enum": ["OPEN", "PAID", "SHIPPED"]},
+        "Customer": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "name": {"type": "string"},
+                "email": {"type": "string"},
+            },
+        },
+        "LineItem": {
+            "type": "object",
+            "properties": {
+                "sku": {"type": "string"},
+                "quantity": {"type": "integer"},
+                "price": {"type": "number"},
+            },
+        },
+        "Order": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "status": {"$ref": "#/definitions/Status"},
+                "customer": {"$ref": "#/definitions/Customer"},
+                "items": {
+                    "type": "array",
+                    "items": {"$ref": "#/definitions/LineItem"},
+                },
+                "tags": {"type": "array", "items": {"type": "string"}},
+                "note": {"type": "string"},
+            },
+        },
+    }
+}
+
+MESSAGE = {
+    "id": 1,
+    "status": "PAID",
+    "customer": {"id": 7, "name": "Someone", "email": "someone@example.com"},
+    "items": [
+        {"sku": "A-{}".format(i), "quantity": i, "price": i * 1.5} for i in range(5)
+    ],
+    "tags": ["a", "b"],
+}
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        for check in (False, True):
+            module = generate(
+                os.path.join(d, "model{}.py".format(check)),
+                SCHEMA,
+                use_types=True,
+                constructor_type_check=check,
+                use_slots=False,
+            )
+            report(
+                "from_dict, type checks {}".format(check),
+                lambda: module.Order.from_dict(MESSAGE),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Measures converting a list of messages with the generated Python from_dicts and as_dicts, against calling from_dict
+and as_dict for each message in a list comprehension.
+
+Usage: python benchmarks/bench_from_dicts.py
+"""
+
+import os
+import tempfile
+
+from bench_from_dict import SCHEMA, MESSAGE
+from helpers import generate, report
+
+
+def main():
+    count = 10000
+    messages = [dict(MESSAGE, id=i) for i in range(count)]
+    with tempfile.TemporaryDirectory() as d:
+        module = generate(os.path.join(d, "model.py"), SCHEMA, use_types=True)
+        Order = module.Order
+        report(
+            "[Order.from_dict(m) for m in messages]",
+            lambda: [Order.from_dict(m) for m in messages],
+            runs=20,
+            count=count,
+        )
+        report(
+            "list(Order.from_dicts(messages))",
+            lambda: list(Order.from_dicts(messages)),
+            runs=20,
+            count=count,
+        )
+        orders = list(Order.from_dicts(messages))
+        report(
+            "[o.as_dict() for o in orders]",
+            lambda: [o.as_dict() for o in orders],
+            runs=20,
+            count=count,
+        )
+        report(
+            "list(Order.as_dicts(orders))",
+            lambda: list(Order.as_dicts(orders)),
+            runs=20,
+            count=count,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures importing generated Python from a schema with many definitions as a single module, compared to a package
+with --module-per-definition, from which only the modules of the classes used are imported.
+
+Usage: python benchmarks/bench_import.py [number of definitions, default 2000]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+from schemas import definitions_schema
+
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+
+IMPORT = """
+import sys, time
+sys.path.insert(0, {directory!r})
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def generate(schema: dict, output: str, module_per_definition: bool):
+    loader = JsonSchema2Popo(language="python")
+    loader.update_args(
+        argparse.Namespace(use_types=True, module_per_definition=module_per_definition)
+    )
+    loader.process(schema)
+    # Formatting doesn't change how long importing takes, and black takes minutes for thousands of definitions
+    loader.module.format_code = lambda code: code
+    loader.write_file(output)
+
+
+def measure(directory: str, statement: str, repeat: int = 5) -> float:
+    code = IMPORT.format(directory=directory, statement=statement)
+    # The first import also writes the bytecode, which later imports reuse as a worker process would
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    times = []
+    for _ in range(repeat + 1):
+        out = subprocess.run(
+            [sys.executable, "-c", code], check=True, stdout=subprocess.PIPE, env=env
+        )
+        times.append(float(out.stdout))
+    return min(times[1:])
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    schema = definitions_schema(count)
+    last = "Def{}".format(count - 1)
+    with tempfile.TemporaryDirectory() as d:
+        generate(schema, os.path.join(d, "single.py"), False)
+        generate(schema, os.path.join(d, "package"), True)
+        for label, statement in (
+            ("single module", "from single import Def0"),
+            ("package", "import package"),
+            ("package, Def0", "from package import Def0"),
+            (
+                "package, {} and its dependencies".format(last),
+                "from package import {}".format(last),
+            ),
+        ):
+            print("{:<40} {:8.1f}ms".format(label, measure(d, statement) * 1e3))
+
+
+if __name__ == "__main__":
+    main()
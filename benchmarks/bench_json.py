@@ -0,0 +1,54 @@
+"""
+Measures encoding and decoding messages with the generated Python to_json/from_json, using orjson and the standard
+library json module, against json.dumps(as_dict()) and from_dict(json.loads()).
+
+Usage: python benchmarks/bench_json.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+
+from bench_from_dict import SCHEMA, MESSAGE
+from helpers import generate, report
+
+
+def generate_json(path: str, use_orjson: bool):
+    orjson = sys.modules.get("orjson")
+    if not use_orjson:
+        sys.modules["orjson"] = None
+    try:
+        return generate(path, SCHEMA, json_methods=True)
+    finally:
+        if orjson is not None:
+            sys.modules["orjson"] = orjson
+        else:
+            sys.modules.pop("orjson", None)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as d:
+        stdlib = generate_json(os.path.join(d, "stdlib.py"), use_orjson=False)
+        order = stdlib.Order.from_dict(MESSAGE)
+        text = json.dumps(order.as_dict())
+        report("json.dumps(as_dict())", lambda: json.dumps(order.as_dict()))
+        report("to_json() with json", order.to_json)
+        report(
+            "from_dict(json.loads())",
+            lambda: stdlib.Order.from_dict(json.loads(text)),
+        )
+        report("from_json() with json", lambda: stdlib.Order.from_json(text))
+        try:
+            import orjson  # noqa
+        except ImportError:
+            print("orjson is not installed")
+            return
+        fast = generate_json(os.path.join(d, "orjson.py"), use_orjson=True)
+        order = fast.Order.from_dict(MESSAGE)
+        report("to_json() with orjson", order.to_json)
+        report("from_json() with orjson", lambda: fast.Order.from_json(text))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measures decoding a message with a large nested array using the generated Python from_dict, with and without
+--lazy-decoding, when only a top level field is read, when everything is read, and when it is encoded again with
+as_dict.
+
+Usage: python benchmarks/bench_lazy.py
+"""
+
+import os
+import tempfile
+import timeit
+
+from bench_from_dict import SCHEMA, MESSAGE
+from helpers import generate
+
+LARGE_MESSAGE = dict(
+    MESSAGE,
+    items=[
+        {"sku": "A-{}".format(i), "quantity": i, "price": i * 1.5} for i in range(200)
+    ],
+)
+
+
+def main():
+    runs = 500
+    with tempfile.TemporaryDirectory() as d:
+        for lazy in (False, True):
+            module = generate(
+                os.path.join(d, "model{}.py".format(lazy)),
+                SCHEMA,
+                use_types=True,
+                constructor_type_check=True,
+                lazy_decoding=lazy,
+            )
+            Order = module.Order
+            cases = {
+                "read id": lambda: Order.from_dict(LARGE_MESSAGE).id,
+                "read all items": lambda: [
+                    item.price for item in Order.from_dict(LARGE_MESSAGE).items
+                ],
+                "as_dict": lambda: Order.from_dict(LARGE_MESSAGE).as_dict(),
+            }
+            for label, f in cases.items():
+                seconds = min(timeit.repeat(f, number=runs, repeat=5))
+                print(
+                    "lazy {:<5}  {:<15} {:8.1f}us".format(
+                        str(lazy), label, seconds / runs * 1e6
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
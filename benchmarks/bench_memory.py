@@ -0,0 +1,37 @@
+"""
+Reports how much memory the parsed model takes per node (Definition or Property).
+
+Usage: python benchmarks/bench_memory.py
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from schemas import definitions_schema
+
+from jsonschema2popo.classes import Definition, Property
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+
+
+def main():
+    count = 2000
+    schema = definitions_schema(count)
+    loader = JsonSchema2Popo(language="python")
+    loader.update_args(argparse.Namespace())
+
+    gc.collect()
+    tracemalloc.start()
+    loader.process(schema)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = sum(1 for o in gc.get_objects() if isinstance(o, (Definition, Property)))
+    print("{} definitions, {} nodes".format(count, nodes))
+    print("model:          {:.1f} MiB".format(current / 2**20))
+    print("bytes per node: {:.0f}".format(current / nodes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Measures how long it takes to parse schemas of growing size. Parse time should grow linearly with the number of
+definitions and references.
+
+Usage: python benchmarks/bench_parse.py
+"""
+
+import argparse
+import time
+
+from schemas import definitions_schema
+
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+
+
+def time_parse(count: int) -> float:
+    schema = definitions_schema(count)
+    loader = JsonSchema2Popo(language="python")
+    loader.update_args(argparse.Namespace())
+    start = time.perf_counter()
+    loader.process(schema)
+    return time.perf_counter() - start
+
+
+def main():
+    print("{:>12} {:>12} {:>14}".format("definitions", "seconds", "us/definition"))
+    for count in (250, 500, 1000, 2000, 4000):
+        elapsed = time_parse(count)
+        print(
+            "{:>12} {:>12.3f} {:>14.1f}".format(count, elapsed, elapsed / count * 1e6)
+        )
+
+
+if __name__ == "__main__":
+    main()
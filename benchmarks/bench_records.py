@@ -0,0 +1,58 @@
+"""
+Compares the memory held by decoded messages, and the time to decode them, for generated Python classes and for
+--named-tuples records.
+
+Usage: python benchmarks/bench_records.py
+"""
+
+import os
+import tempfile
+import timeit
+import tracemalloc
+
+from bench_from_dict import SCHEMA, MESSAGE
+from helpers import generate
+
+STYLES = {
+    "classes": dict(use_slots=False),
+    "classes, --use_slots": dict(use_slots=True),
+    "--named-tuples": dict(named_tuples=True),
+}
+
+
+def memory(module, count: int = 20000) -> float:
+    messages = [dict(MESSAGE, id=i) for i in range(count)]
+    tracemalloc.start()
+    orders = list(module.Order.from_dicts(messages))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del orders
+    return size / count
+
+
+def main():
+    print("{:<22} {:>14} {:>12}".format("", "bytes/message", "from_dict"))
+    with tempfile.TemporaryDirectory() as d:
+        for i, (label, kwargs) in enumerate(STYLES.items()):
+            module = generate(
+                os.path.join(d, "model{}.py".format(i)),
+                SCHEMA,
+                use_types=True,
+                constructor_type_check=True,
+                **kwargs
+            )
+            runs = 20000
+            seconds = min(
+                timeit.repeat(
+                    lambda: module.Order.from_dict(MESSAGE), number=runs, repeat=5
+                )
+            )
+            print(
+                "{:<22} {:>14.0f} {:>10.2f}us".format(
+                    label, memory(module), seconds / runs * 1e6
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
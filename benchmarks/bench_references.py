@@ -0,0 +1,36 @@
+"""
+Measures parse time and memory used by the parsed model for a schema which is made up mostly of references.
+
+Usage: python benchmarks/bench_references.py
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from schemas import references_schema
+
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+
+
+def main():
+    count, refs = 500, 100
+    schema = references_schema(count, refs)
+    loader = JsonSchema2Popo(language="python")
+    loader.update_args(argparse.Namespace())
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    loader.process(schema)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print("{} references".format(count * refs))
+    print("parse:  {:.3f}s".format(elapsed))
+    print("model:  {:.1f} MiB".format(current / 2**20))
+    print("peak:   {:.1f} MiB".format(peak / 2**20))
+
+
+if __name__ == "__main__":
+    main()
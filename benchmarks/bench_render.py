@@ -0,0 +1,42 @@
+"""
+Measures how long it takes to render the templates of each builtin language for a large schema.
+
+Usage: python benchmarks/bench_render.py
+"""
+
+import argparse
+import io
+import time
+
+from schemas import definitions_schema
+
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+
+LANGUAGES = {
+    "python": dict(use_types=True, constructor_type_check=True, use_slots=True),
+    "js": dict(constructor_type_check=True),
+    "go": dict(package_name="generated"),
+}
+
+
+def time_render(language: str, count: int) -> float:
+    loader = JsonSchema2Popo(language=language)
+    loader.update_args(argparse.Namespace(**LANGUAGES[language]))
+    loader.process(definitions_schema(count))
+    start = time.perf_counter()
+    loader.write_file(io.StringIO())
+    return time.perf_counter() - start
+
+
+def main():
+    count = 2000
+    for language in LANGUAGES:
+        print(
+            "render {} definitions, {:>6}: {:.3f}s".format(
+                count, language, time_render(language, count)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
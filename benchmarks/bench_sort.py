@@ -0,0 +1,87 @@
+"""
+Measures the topological sort of a 10k definition schema with the builtin sorter and with networkx, as well as the
+cold start time of the command line tool.
+
+Usage: python benchmarks/bench_sort.py
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from schemas import definitions_schema
+
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def time_sort(count: int, use_networkx: bool) -> float:
+    loader = JsonSchema2Popo(language="python", use_networkx=use_networkx)
+    loader.update_args(argparse.Namespace())
+    schema = definitions_schema(count)
+    for name, obj in schema["definitions"].items():
+        loader.definitions.append(loader.definition_parser(name, obj))
+    graph = {
+        m.full_name_path: set(loader.get_model_dependencies(m))
+        for m in loader.definitions
+    }
+    start = time.perf_counter()
+    loader.topological_sort(graph)
+    return time.perf_counter() - start
+
+
+def time_cli(runs: int = 10) -> float:
+    with tempfile.TemporaryDirectory() as d:
+        schema_file = os.path.join(d, "schema.json")
+        with open(schema_file, "w") as f:
+            json.dump(definitions_schema(5), f)
+        start = time.perf_counter()
+        for _ in range(runs):
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "jsonschema2popo",
+                    "-o",
+                    os.path.join(d, "model.py"),
+                    schema_file,
+                ],
+                check=True,
+                cwd=REPO,
+            )
+        return (time.perf_counter() - start) / runs
+
+
+def time_import(module: str, runs: int = 10) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run([sys.executable, "-c", "import " + module], check=True)
+    return (time.perf_counter() - start) / runs
+
+
+def main():
+    count = 10000
+    print(
+        "sort {} definitions, builtin:  {:.3f}s".format(count, time_sort(count, False))
+    )
+    try:
+        import networkx  # noqa
+
+        print(
+            "sort {} definitions, networkx: {:.3f}s".format(
+                count, time_sort(count, True)
+            )
+        )
+        print("import networkx:                {:.3f}s".format(time_import("networkx")))
+    except ImportError:
+        print("networkx is not installed, skipping comparison")
+    print("CLI cold start:                 {:.3f}s".format(time_cli()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Reports the peak memory used to load a large schema document by parsing all of it with json.load before processing
+it, compared to processing the definitions as they are parsed.
+
+Usage: python benchmarks/bench_stream.py [size in MB, default 200]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from schemas import definitions_schema
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+LOAD = """
+import json, resource, sys, time
+sys.path.insert(0, {repo!r})
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+loader = JsonSchema2Popo(language="python")
+start = time.perf_counter()
+with open({path!r}, "r", encoding="utf-8") as f:
+    if {whole}:
+        loader.process(json.load(f))
+    else:
+        loader.load(f)
+print(time.perf_counter() - start, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_schema(path: str, size: int):
+    """
+    Write definitions with long examples, which the generator ignores, until the file is about ``size`` bytes
+    """
+    examples = ["example value {}".format(i) * 4 for i in range(100)]
+    block = definitions_schema(1000)["definitions"]
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"title": "Large", "definitions": {')
+        while f.tell() < size:
+            # Repeat the same block of definitions under a new prefix, with references to the same prefix
+            prefix = "B{}".format(count // len(block))
+            for name, definition in block.items():
+                definition = dict(definition, examples=examples)
+                f.write(", " if count else "")
+                f.write('"{}{}": '.format(prefix, name))
+                f.write(
+                    json.dumps(definition).replace(
+                        "#/definitions/Def", "#/definitions/{}Def".format(prefix)
+                    )
+                )
+                count += 1
+        f.write("}}")
+    return count
+
+
+def measure(path: str, whole: bool):
+    code = LOAD.format(repo=REPO, path=path, whole=whole)
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, stdout=subprocess.PIPE
+    )
+    seconds, rss = out.stdout.split()
+    return float(seconds), int(rss) / 1024
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "schema.json")
+        count = write_schema(path, size * 2**20)
+        print(
+            "{:.0f} MB schema, {} definitions".format(
+                os.path.getsize(path) / 2**20, count
+            )
+        )
+        for label, whole in (("json.load + process", True), ("streaming load", False)):
+            seconds, rss = measure(path, whole)
+            print("{:<20} {:6.1f}s  peak RSS {:7.1f} MiB".format(label, seconds, rss))
+
+
+if __name__ == "__main__":
+    main()
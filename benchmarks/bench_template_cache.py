@@ -0,0 +1,53 @@
+"""
+Measures the per invocation overhead of loading the templates with a cold and a warm template cache, and with the
+cache disabled.
+
+Usage: python benchmarks/bench_template_cache.py
+"""
+
+import tempfile
+import time
+
+import schemas  # noqa
+
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+
+
+def time_load(language: str, cache_dir: str = None, runs: int = 20) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        loader = JsonSchema2Popo(
+            language=language,
+            template_cache=cache_dir is not None,
+            template_cache_dir=cache_dir,
+        )
+        loader.jinja.get_template(loader.module.template())
+    return (time.perf_counter() - start) / runs
+
+
+def time_cold(language: str, runs: int = 20) -> float:
+    total = 0
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as d:
+            total += time_load(language, d, runs=1)
+    return total / runs
+
+
+def main():
+    print("{:>8} {:>10} {:>10} {:>10}".format("language", "no cache", "cold", "warm"))
+    for language in ("python", "js", "go"):
+        with tempfile.TemporaryDirectory() as d:
+            time_load(language, d, runs=1)
+            warm = time_load(language, d)
+        print(
+            "{:>8} {:>9.1f}ms {:>9.1f}ms {:>9.1f}ms".format(
+                language,
+                time_load(language) * 1000,
+                time_cold(language) * 1000,
+                warm * 1000,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Measures validating messages with the generated Python validate method, against validating the same messages with
+the jsonschema library.
+
+Usage: python benchmarks/bench_validate.py
+"""
+
+import copy
+import os
+import tempfile
+
+from bench_from_dict import SCHEMA, MESSAGE
+from helpers import generate, report
+
+
+def add_validations(schema):
+    schema = copy.deepcopy(schema)
+    definitions = schema["definitions"]
+    customer = definitions["Customer"]["properties"]
+    customer["id"].update(minimum=1)
+    customer["name"].update(minLength=1, maxLength=100)
+    customer["email"].update(pattern="^[^@]+@[^@]+$")
+    item = definitions["LineItem"]["properties"]
+    item["sku"].update(pattern="^[A-Z]-\\d+$")
+    item["quantity"].update(minimum=0, maximum=1000)
+    item["price"].update(minimum=0)
+    order = definitions["Order"]
+    order["required"] = ["id", "customer"]
+    order["properties"]["items"].update(minItems=1, maxItems=100)
+    return schema
+
+
+def main():
+    schema = add_validations(SCHEMA)
+    with tempfile.TemporaryDirectory() as d:
+        module = generate(os.path.join(d, "model.py"), schema, validation=True)
+        Order = module.Order
+        order = Order.from_dict(MESSAGE)
+        report("validate()", order.validate)
+        report(
+            "from_dict(validate=True)", lambda: Order.from_dict(MESSAGE, validate=True)
+        )
+        try:
+            import jsonschema
+        except ImportError:
+            print("jsonschema is not installed")
+            return
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator = validator_class(dict(schema, **{"$ref": "#/definitions/Order"}))
+        report("jsonschema validate", lambda: validator.validate(MESSAGE))
+        report(
+            "jsonschema validate + from_dict",
+            lambda: (validator.validate(MESSAGE), Order.from_dict(MESSAGE)),
+        )
+
+
+if __name__ == "__main__":
+    main()
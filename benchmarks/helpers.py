@@ -0,0 +1,33 @@
+"""
+Helpers shared by the benchmarks in this directory which generate Python code and time it.
+"""
+
+import argparse
+import importlib.util
+import timeit
+
+import schemas  # noqa
+
+from jsonschema2popo.jsonschema2popo import JsonSchema2Popo
+
+
+def generate(path: str, schema: dict, **options):
+    """
+    Generate Python code for ``schema`` into ``path`` with the given command line ``options``, and import it.
+    """
+    loader = JsonSchema2Popo(language="python")
+    loader.update_args(argparse.Namespace(**options))
+    loader.process(schema)
+    loader.write_file(path)
+    spec = importlib.util.spec_from_file_location("generated", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def report(label: str, f, runs: int = 20000, count: int = 1):
+    """
+    Print the best time per call of ``f`` over ``runs`` calls, or per message when each call handles ``count`` of them.
+    """
+    seconds = min(timeit.repeat(f, number=runs, repeat=5))
+    print("{:<44} {:10.2f}us".format(label, seconds / runs / count * 1e6))
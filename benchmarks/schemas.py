@@ -0,0 +1,70 @@
+"""
+Synthetic JSON Schema documents used by the benchmarks in this directory.
+"""
+
+import os
+import sys
+
+# Allow running the benchmarks straight from a checkout without installing the package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def definitions_schema(count: int, refs_per_definition: int = 3) -> dict:
+    """
+    Build a schema with ``count`` object definitions where every definition has a few primitive properties, a nested
+    object, and ``refs_per_definition`` references to definitions declared before it.
+    """
+    definitions = {}
+    for i in range(count):
+        properties = {
+            "id": {"type": "integer"},
+            "name": {"type": "string", "maxLength": 64},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "nested": {
+                "type": "object",
+                "properties": {
+                    "x": {"type": "number"},
+                    "y": {"type": "number"},
+                },
+            },
+        }
+        for r in range(1, refs_per_definition + 1):
+            if i - r < 0:
+                break
+            properties["ref{}".format(r)] = {
+                "$ref": "#/definitions/Def{}".format(i - r)
+            }
+        if i > 0:
+            properties["refList"] = {
+                "type": "array",
+                "items": {"$ref": "#/definitions/Def{}".format(i // 2)},
+            }
+        definitions["Def{}".format(i)] = {"type": "object", "properties": properties}
+    return {"definitions": definitions}
+
+
+def references_schema(count: int, refs_per_definition: int) -> dict:
+    """
+    Build a schema with ``count`` small object definitions followed by ``count`` definitions which only hold
+    ``refs_per_definition`` references to them.
+    """
+    definitions = {}
+    for i in range(count):
+        definitions["Target{}".format(i)] = {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "name": {"type": "string"},
+            },
+        }
+    for i in range(count):
+        definitions["Holder{}".format(i)] = {
+            "type": "object",
+            "properties": {
+                "ref{}".format(r): {
+                    "$ref": "#/definitions/Target{}".format((i + r) % count)
+                }
+                for r in range(refs_per_definition)
+            },
+        }
+    return {"definitions": definitions}
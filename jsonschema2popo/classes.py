@@ -22,8 +22,65 @@ class Definition:
     comment: str
     is_primitive: bool = True
 
+    __slots__ = (
+        "_name",
+        "_parent",
+        "_children",
+        "_paths_cache",
+        "_paths_cache_generation",
+        "extends",
+        "comment",
+    )
+
+    # Incremented whenever a name, parent, or reference changes anywhere so that every node's cached paths are rebuilt
+    _paths_generation = 0
+
     def __init__(self):
-        self.children = set()
+        self._name = None
+        self._parent = None
+        self._children = None
+        self._paths_cache = None
+        self._paths_cache_generation = Definition._paths_generation
+
+    @staticmethod
+    def invalidate_paths():
+        Definition._paths_generation += 1
+
+    def _cached_path(self, key, compute: Callable[[], Any]):
+        if (
+            self._paths_cache is None
+            or self._paths_cache_generation != Definition._paths_generation
+        ):
+            self._paths_cache = {}
+            self._paths_cache_generation = Definition._paths_generation
+        if key not in self._paths_cache:
+            self._paths_cache[key] = compute()
+        return self._paths_cache[key]
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        self._name = name
+        Definition.invalidate_paths()
+
+    @property
+    def parent(self) -> "Definition":
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent: "Definition"):
+        self._parent = parent
+        Definition.invalidate_paths()
+
+    @property
+    def children(self) -> Set["Definition"]:
+        # Only created once something asks for it, so that leaf nodes don't each carry an empty set
+        if self._children is None:
+            self._children = set()
+        return self._children
 
     @property
     def string_type(self):
@@ -31,30 +88,40 @@ class Definition:
 
     @property
     def names(self):
-        return list(map(lambda a: a.name, self.ancestors()))
+        return list(
+            self._cached_path(
+                "names", lambda: tuple(a.name for a in self._ancestors(None))
+            )
+        )
 
     def ancestors(self, stop: "Definition" = None):
-        ancestors = [self]
-        p = self.parent
-        while p is not None and p != stop:
-            ancestors.append(p)
-            p = p.parent
-        return list(reversed(ancestors))
+        return list(self._ancestors(stop))
+
+    def _ancestors(self, stop: "Definition" = None):
+        def compute():
+            ancestors = [self]
+            p = self.parent
+            while p is not None and p != stop:
+                ancestors.append(p)
+                p = p.parent
+            return tuple(reversed(ancestors))
+
+        return self._cached_path(("ancestors", stop), compute)
 
     @property
     def full_name_path(self):
-        return ".".join(self.names)
+        return self._cached_path("full_name_path", lambda: ".".join(self.names))
 
     def full_name_python_path(self, relative_to: "Definition" = None):
-        l = list(
-            map(
-                lambda a: a.python_type_name,
-                self.ancestors(
+        return self._cached_path(
+            ("full_name_python_path", relative_to),
+            lambda: ".".join(
+                a.python_type_name
+                for a in self._ancestors(
                     stop=Definition.lowest_common_ancestor(self, relative_to)
-                ),
-            )
+                )
+            ),
         )
-        return ".".join(l)
 
     @property
     def python_type_name(self):
@@ -72,8 +139,8 @@ class Definition:
     def lowest_common_ancestor(a: "Definition", b: "Definition") -> "Definition":
         if b is None:
             return a
-        path1 = a.ancestors()
-        path2 = b.ancestors()
+        path1 = a._ancestors()
+        path2 = b._ancestors()
         i = 0
         while i < len(path1) and i < len(path2):
             if path1[i] != path2[i]:
@@ -87,6 +154,8 @@ class ListNode(Definition):
     item_format: Optional[str]
     type = "list"
 
+    __slots__ = ("item_type", "item_format")
+
     def __init__(
         self, item_type: Definition = None, parent: Definition = None, name: str = None
     ):
@@ -113,6 +182,8 @@ class Property:
     format: str
     validations: Dict
 
+    __slots__ = ("name", "default", "definition", "comment", "format", "validations")
+
     def __init__(
         self,
         name=None,
@@ -131,6 +202,8 @@ class ObjectNode(Definition):
     properties: List[Property]
     properties_have_comments: bool
 
+    __slots__ = ("properties", "properties_have_comments")
+
     def __init__(self, properties=None, parent: Definition = None, name: str = None):
         super().__init__()
         if properties is None:
@@ -157,6 +230,8 @@ class StringNode(Definition):
     type = "string"
     specific_type: Optional[type]
 
+    __slots__ = ("specific_type",)
+
     def __init__(self, parent: Definition = None, name: str = None):
         super().__init__()
         self.parent = parent
@@ -174,6 +249,8 @@ class EnumNode(Definition):
     values: Dict[str, str]
     is_primitive = False
 
+    __slots__ = ("value_type", "values")
+
     def __init__(
         self, parent: Definition = None, name: str = None, values: Dict[str, str] = None
     ):
@@ -186,6 +263,8 @@ class EnumNode(Definition):
 class NumericNode(Definition):
     type = "number"
 
+    __slots__ = ()
+
     def __init__(self, parent: Definition = None, name: str = None):
         super().__init__()
         self.parent = parent
@@ -195,6 +274,8 @@ class NumericNode(Definition):
 class IntegerNode(Definition):
     type = "integer"
 
+    __slots__ = ()
+
     def __init__(self, parent: Definition = None, name: str = None):
         super().__init__()
         self.parent = parent
@@ -204,6 +285,8 @@ class IntegerNode(Definition):
 class BooleanNode(Definition):
     type = "boolean"
 
+    __slots__ = ()
+
     def __init__(self, parent: Definition = None, name: str = None):
         super().__init__()
         self.parent = parent
@@ -213,6 +296,8 @@ class BooleanNode(Definition):
 class NullNode(Definition):
     type = "null"
 
+    __slots__ = ()
+
     def __init__(self, parent: Definition = None, name: str = None):
         super().__init__()
         self.parent = parent
@@ -222,6 +307,11 @@ class NullNode(Definition):
 class ReferenceNode(Definition):
     value: Definition
 
+    __slots__ = ("__value",)
+
+    # Attributes which belong to the reference itself and must not be read from the referenced definition
+    _not_forwarded = {"comment"}
+
     def __init__(
         self, value: Definition = None, parent: Definition = None, name: str = None
     ):
@@ -231,32 +321,51 @@ class ReferenceNode(Definition):
         self.name = name
 
     def __value_getter(self):
+        # A reference to another reference acts as a reference to whatever that one refers to
+        if isinstance(self.__value, ReferenceNode):
+            return self.__value.value
         return self.__value
 
     def __value_setter(self, v: Definition):
-        # Automatically copy all properties from the referenced value into this type
+        self.__value = v
+        Definition.invalidate_paths()
+
+    def __getattr__(self, item):
+        # Forward everything that this node doesn't have to the referenced value
         # so that users can just do x.y instead of x.value.y; this way the fact that this
         # is a reference shouldn't matter to any users.
-        # Copy most, but not quite all values.
-        self.__value = v
-        for k in v.__dir__():
-            if (
-                k.startswith("__")
-                or k == "parent"
-                or k == "name"
-                or k == "comment"
-                or k == "full_name_python_path"
-            ):
-                continue
-            if isinstance(v.__getattribute__(k), property):
-                continue
-            try:
-                self.__setattr__(k, v.__getattribute__(k))
-            except AttributeError:
-                pass
+        # Only called when normal lookup fails, so the reference's own name, parent, and comment are never forwarded.
+        if item.startswith("_") or item in ReferenceNode._not_forwarded:
+            raise AttributeError(item)
+        value = self.value
+        if value is None:
+            raise AttributeError(item)
+        return getattr(value, item)
 
     value = property(__value_getter, __value_setter)
 
+    @property
+    def is_primitive(self):
+        if self.value is None:
+            return Definition.is_primitive
+        return self.value.is_primitive
+
+    @property
+    def children(self) -> Set[Definition]:
+        if self.value is None:
+            return super().children
+        return self.value.children
+
+    def ancestors(self, stop: Definition = None):
+        if self.value is None:
+            return super().ancestors(stop)
+        return self.value.ancestors(stop)
+
+    def _ancestors(self, stop: Definition = None):
+        if self.value is None:
+            return super()._ancestors(stop)
+        return self.value._ancestors(stop)
+
     @property
     def string_type(self):
         return self.value.string_type
@@ -296,6 +405,12 @@ class CodeGenPlugin(abc.ABC):
     def template(self) -> str:
         pass
 
+    def extra_templates(self) -> List[str]:
+        """
+        Templates other than template which the plugin renders or includes, so that changes to them are noticed
+        """
+        return []
+
     def jinja_globals(self) -> Dict[str, Callable]:
         pass
 
@@ -311,5 +426,28 @@ class CodeGenPlugin(abc.ABC):
     def extra_jinja_inputs(self) -> Dict[str, Any]:
         return {}
 
+    def format_code(self, code: str) -> str:
+        return code
+
+    def writes_directory(self) -> bool:
+        """
+        Whether the output path is a directory for write_directory to fill, rather than a single file
+        """
+        return False
+
+    def write_directory(self, loader, directory: str) -> None:
+        """
+        Write the definitions of loader into several files in directory, using loader.render_code to render each one
+        """
+        raise NotImplementedError
+
     def after_generation(self, filename: Optional[str] = None) -> None:
         pass
+
+    def after_batch_generation(self, filenames: List[str]) -> None:
+        """
+        Called once a run has written all of filenames. Plugins which can handle several files at once more cheaply than
+        one at a time override this as well as after_generation
+        """
+        for filename in filenames:
+            self.after_generation(filename=filename)
@@ -1,11 +1,15 @@
 import argparse
+import logging
 import os
-from typing import Dict, Callable, Any
+import subprocess
+from typing import Dict, Callable, Any, List
 
 from jsonschema2popo import version
 from jsonschema2popo.classes import CodeGenPlugin
 from jsonschema2popo.python.python import Python
 
+logger = logging.getLogger(__name__)
+
 
 class Go(CodeGenPlugin):
     def plugin_name(self) -> str:
@@ -37,8 +41,21 @@ class Go(CodeGenPlugin):
         return os.path.dirname(os.path.abspath(__file__))
 
     def after_generation(self, filename=None):
-        Go.format_go_file(filename=filename)
+        # Code written to stdout can't be formatted in place
+        if filename is not None and os.path.isfile(filename):
+            Go.format_go_file(filename=filename)
+
+    def after_batch_generation(self, filenames: List[str]) -> None:
+        Go.format_go_files(filenames)
+
+    @staticmethod
+    def format_go_files(filenames: List[str]):
+        # gofmt can't read from memory without a process per file, so format the whole batch with one process
+        try:
+            subprocess.run(["gofmt", "-w", *filenames], check=False)
+        except OSError as e:
+            logger.warning("Unable to run gofmt: %s", e)
 
     @staticmethod
     def format_go_file(filename):
-        os.system("go fmt " + filename)
+        Go.format_go_files([filename])
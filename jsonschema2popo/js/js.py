@@ -48,8 +48,8 @@ class JS(CodeGenPlugin):
     def template_search_path(self) -> str:
         return os.path.dirname(os.path.abspath(__file__))
 
-    def after_generation(self, filename=None):
-        JS.format_js_file(filename=filename)
+    def format_code(self, code: str) -> str:
+        return JS.format_js_code(code)
 
     def jsdoc_type(
         self,
@@ -88,7 +88,7 @@ class JS(CodeGenPlugin):
             return string_to_type(v)
 
     @staticmethod
-    def format_js_file(filename):
+    def format_js_code(code: str) -> str:
         try:
             import jsbeautifier
 
@@ -98,9 +98,13 @@ class JS(CodeGenPlugin):
             format_opts.max_preserve_newlines = 2
             format_opts.wrap_line_length = 120
 
-            with open(filename, "r") as fr:
-                file = fr.read()
-                with open(filename, "w") as f:
-                    f.write(jsbeautifier.beautify(file, opts=format_opts))
+            return jsbeautifier.beautify(code, opts=format_opts)
         except:
-            pass
+            return code
+
+    @staticmethod
+    def format_js_file(filename):
+        with open(filename, "r") as fr:
+            code = fr.read()
+        with open(filename, "w") as f:
+            f.write(JS.format_js_code(code))
@@ -0,0 +1,127 @@
+import codecs
+import json
+from typing import Any, Iterator, Tuple
+
+CHUNK_SIZE = 64 * 1024
+# Characters which may appear in a JSON number after its first digit
+NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+
+class _Reader:
+    """
+    Buffers a file so that JSON values can be decoded from it one at a time, keeping only the unparsed remainder of
+    the file in memory
+    """
+
+    decoder = json.JSONDecoder()
+
+    def __init__(self, fp, chunk_size: int = CHUNK_SIZE):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.bytes_decoder = None
+
+    def fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(size)
+        self.eof = not chunk
+        if isinstance(chunk, bytes):
+            if self.bytes_decoder is None:
+                self.bytes_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+            chunk = self.bytes_decoder.decode(chunk, final=self.eof)
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return not self.eof
+
+    def peek(self) -> str:
+        """
+        Skip whitespace and return the next character, or an empty string at the end of the file
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill(self.chunk_size):
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise self.error("Expecting '{}' delimiter".format(char))
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value which runs to the end of the buffer may continue in the next chunk. A number may also stop
+                # early, such as 1 from "1." or "1e", until something which can't continue it has been read.
+                if self.eof or (
+                    end < len(self.buffer)
+                    and not (
+                        isinstance(value, (int, float)) and self.continues_number(end)
+                    )
+                ):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Read at least as much as is buffered so that large values are not decoded over and over again
+            self.fill(max(self.chunk_size, len(self.buffer) - self.pos))
+
+    def continues_number(self, end: int) -> bool:
+        """
+        Whether everything buffered after end could still be part of the number which ends there
+        """
+        for char in self.buffer[end:]:
+            if char not in NUMBER_CHARS:
+                return False
+        return True
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+
+def _object_items(reader: _Reader) -> Iterator[str]:
+    """
+    Yield the keys of the object at the current position. The caller must consume each value before continuing.
+    """
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return
+    while True:
+        if reader.peek() != '"':
+            raise reader.error("Expecting property name enclosed in double quotes")
+        key = reader.value()
+        reader.expect(":")
+        yield key
+        if reader.peek() == "}":
+            reader.pos += 1
+            return
+        reader.expect(",")
+
+
+def iter_schema(
+    fp, chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[Tuple[str, ...], Any]]:
+    """
+    Incrementally parse a schema document without holding all of it in memory at once.
+
+    Yields (("definitions", name), definition) for each definition as soon as it has been read, the same for
+    "$defs", and ((key,), value) for every other key of the root object.
+    """
+    reader = _Reader(fp, chunk_size)
+    for key in _object_items(reader):
+        if key in ("definitions", "$defs") and reader.peek() == "{":
+            for name in _object_items(reader):
+                yield (key, name), reader.value()
+        else:
+            yield (key,), reader.value()
+    if reader.peek() != "":
+        raise reader.error("Extra data")
@@ -1,16 +1,21 @@
 #!/usr/bin/env python
 import argparse
+import hashlib
+import heapq
 import importlib
+import io
 import json
 import logging
 import os
 import re
 import sys
+import time
+import urllib.parse
 from collections import defaultdict
-from typing import List, Optional, Dict, Set
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Dict, Set, FrozenSet, Iterable, Tuple
 
-import networkx
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
 
 from jsonschema2popo.classes import (
     Definition,
@@ -27,10 +32,14 @@ from jsonschema2popo.classes import (
     extra_generation_options,
     CodeGenPlugin,
 )
+from jsonschema2popo.json_stream import iter_schema
 from . import __version__
 
 logger = logging.getLogger("main")
 
+# Seconds between checks for changed files in --watch mode
+WATCH_INTERVAL = 0.05
+
 J2P_TYPES = {
     "string": str,
     "integer": int,
@@ -47,6 +56,150 @@ def string_to_type(t: str) -> str:
     return J2P_TYPES[t].__name__ if t in J2P_TYPES else t
 
 
+# Keywords which hold named schemas that become definitions
+DEFINITION_KEYWORDS = ("definitions", "$defs")
+
+
+def split_ref(ref: str) -> Optional[Tuple[str, List[str]]]:
+    """
+    Split a $ref into the file which it refers to, which is empty for the current document, and the unescaped tokens
+    of its JSON Pointer. Returns None when the fragment is not a JSON Pointer.
+    """
+    file, _, fragment = ref.partition("#")
+    fragment = urllib.parse.unquote(fragment)
+    if fragment and not fragment.startswith("/"):
+        return None
+    tokens = fragment.split("/")[1:]
+    return file, [t.replace("~1", "/").replace("~0", "~") for t in tokens]
+
+
+def pointer_names(tokens: List[str]) -> Optional[List[Optional[str]]]:
+    """
+    Map the tokens of a JSON Pointer onto the names of the nested definitions which it points to, so that it can be
+    looked up by full name path. The first name is None when the pointer is into the root object rather than a
+    definition. Returns None when the pointer is to somewhere that no definition comes from.
+    """
+    if len(tokens) >= 2 and tokens[0] in DEFINITION_KEYWORDS:
+        names: List[Optional[str]] = [tokens[1]]
+        rest = tokens[2:]
+    else:
+        names = [None]
+        rest = tokens
+    i = 0
+    while i < len(rest):
+        if rest[i] == "properties" and i + 1 < len(rest):
+            names.append(rest[i + 1])
+            i += 2
+        elif rest[i] == "items":
+            # Objects in a list are named after the list, including each of the schemas in an items array
+            i += 2 if i + 1 < len(rest) and rest[i + 1].isdigit() else 1
+        elif names[0] is None:
+            # Only properties and items of the root object are generated, not other keys such as #/components
+            return None
+        else:
+            # Nested definitions may also be named directly, such as #/definitions/Outer/Inner
+            names.append(rest[i])
+            i += 1
+    return names
+
+
+def lexicographical_topological_sort(graph: Dict[str, Iterable[str]]) -> List[str]:
+    """
+    Kahn's algorithm which always picks the lexicographically smallest node that has no remaining incoming edges, so
+    the order is stable. Produces the same order as networkx.lexicographical_topological_sort.
+
+    :param graph: Mapping of each node to the nodes that it has an edge to
+    """
+    successors: Dict[str, List[str]] = {}
+    in_degree: Dict[str, int] = {}
+    for node, edges in graph.items():
+        successors.setdefault(node, [])
+        in_degree.setdefault(node, 0)
+        for e in edges:
+            successors[node].append(e)
+            successors.setdefault(e, [])
+            in_degree[e] = in_degree.get(e, 0) + 1
+
+    ready = [node for node, degree in in_degree.items() if degree == 0]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        node = heapq.heappop(ready)
+        ordered.append(node)
+        for e in successors[node]:
+            in_degree[e] -= 1
+            if in_degree[e] == 0:
+                heapq.heappush(ready, e)
+
+    if len(ordered) != len(in_degree):
+        raise ValueError("Definitions contain a circular dependency")
+    return ordered
+
+
+def default_template_cache_dir() -> str:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "jsonschema2popo2")
+
+
+class TemplateBytecodeCache(FileSystemBytecodeCache):
+    """
+    On disk cache of compiled templates which is keyed by the template's path and modification time along with the
+    plugin's name and version. Jinja also verifies a checksum of the template source before using a cached template.
+    """
+
+    def __init__(self, directory: str, plugin: CodeGenPlugin):
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(directory=directory, pattern="__jsonschema2popo_%s.cache")
+        self.plugin_key = "{}|{}|{}".format(
+            plugin.plugin_name(), plugin.plugin_version(), __version__
+        )
+
+    def get_cache_key(self, name, filename=None):
+        try:
+            mtime = os.path.getmtime(filename) if filename else None
+        except OSError:
+            mtime = None
+        key = "|".join([name, filename or "", str(mtime), self.plugin_key])
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def load_bytecode(self, bucket):
+        try:
+            super().load_bytecode(bucket)
+        except OSError:
+            # Just compile the template again if the cache can't be read
+            pass
+
+    def dump_bytecode(self, bucket):
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            logger.debug("Unable to write template cache %s", e)
+
+
+class DocumentCache:
+    """
+    Parsed schema files keyed by absolute path. A file is only parsed again once it has been modified, so a loader
+    which generates many schemas (--batch or --watch) reads each file that they share one time.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+    def load(self, path: str) -> dict:
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self.documents.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with open(path, "r", encoding="utf-8") as f:
+            document = json.load(f)
+        self.documents[path] = (version, document)
+        return document
+
+
 class JsonSchema2Popo:
     """Converts a JSON Schema to a Plain Old Python Object class"""
 
@@ -75,10 +228,10 @@ class JsonSchema2Popo:
         translate_properties=False,
         language="python",
         custom_template="",
+        use_networkx=False,
+        template_cache=True,
+        template_cache_dir=None,
     ):
-        self.list_used = False
-        self.enum_used = False
-
         if language == "python" or language == "js" or language == "go":
             self.module = importlib.import_module("." + language, "jsonschema2popo")
         # Try importing from a specified file path
@@ -90,12 +243,24 @@ class JsonSchema2Popo:
         else:
             self.module = importlib.import_module(language)
         self.module: CodeGenPlugin = self.module.Plugin()
-        search_path = (
-            self.module.template_search_path() if not custom_template else os.getcwd()
-        )
+        search_path = [self.module.template_search_path()]
+        if custom_template:
+            # The plugin's other templates, such as those it includes, are still found after the custom template
+            search_path.insert(0, os.getcwd())
+
+        bytecode_cache = None
+        if template_cache:
+            try:
+                bytecode_cache = TemplateBytecodeCache(
+                    template_cache_dir or default_template_cache_dir(), self.module
+                )
+            except OSError as e:
+                logger.debug("Template cache is disabled %s", e)
 
         self.jinja = Environment(
-            loader=FileSystemLoader(searchpath=search_path), trim_blocks=True
+            loader=FileSystemLoader(searchpath=search_path),
+            trim_blocks=True,
+            bytecode_cache=bytecode_cache,
         )
         self.jinja.filters["regex_replace"] = lambda s, find, replace: re.sub(
             find, replace, s
@@ -111,66 +276,152 @@ class JsonSchema2Popo:
         self.generate_definitions = generate_definitions
         self.translate_properties = translate_properties
         self.custom_template = custom_template
+        self.use_networkx = use_networkx
+        self.document_cache = DocumentCache()
+
+        self.reset()
+        self.__update_self()
 
+    def reset(self):
+        """
+        Forget everything loaded from previous schemas so that this instance, along with its plugin and compiled
+        templates, can be reused to generate another schema
+        """
+        self.list_used = False
+        self.enum_used = False
+        # Files other than the schema itself which were read while loading it
+        self.loaded_files: List[str] = []
+        # Documents of the files which have been processed for this schema, keyed by absolute path
+        self.processed_files: Dict[str, dict] = {}
         self.definitions: List[Definition] = []
+        self.definitions_index: Dict[str, Definition] = {}
         self.searching_for_references: Dict[str, Set[ReferenceNode]] = defaultdict(set)
-        self.__update_self()
+        # Absolute path of the document being processed, None when the schema didn't come from a known file
+        self.document_path: Optional[str] = None
+        # Name path of the root object of each document which has been processed
+        self.document_roots: Dict[Optional[str], str] = {}
+        self.__dependencies_cache: Dict[Definition, FrozenSet[str]] = {}
+        self.__ancestor_paths_cache: Dict[Definition, FrozenSet[str]] = {}
 
     def __update_self(self):
         extra_generation_options["translate_properties"] = self.translate_properties
         extra_generation_options["translate_name_func"] = self.translate_type_name
+        Definition.invalidate_paths()
 
-    def load(self, json_schema_file):
-        self.process(json.load(json_schema_file))
+    def load(self, json_schema_file, path: Optional[str] = None):
+        """
+        Load a schema from a file. References to other files are resolved relative to ``path``, which defaults to the
+        name of the file, or otherwise relative to the current directory.
+        """
+        path = path if path is not None else getattr(json_schema_file, "name", None)
+        if isinstance(path, str) and os.path.isfile(path):
+            self.document_path = os.path.abspath(path)
+        self.process_stream(json_schema_file)
         self.module.after_processing(definitions=self.definitions)
 
     def get_model_dependencies(self, model: Definition) -> List[str]:
+        return list(self.__model_dependencies(model))
+
+    def __model_dependencies(self, model: Definition) -> FrozenSet[str]:
+        # Memoized per node so that shared subtrees (such as list item types, which are reached both through the list
+        # and directly) are only walked once
+        if model in self.__dependencies_cache:
+            return self.__dependencies_cache[model]
+
         deps = set()
         if isinstance(model, ObjectNode):
             for prop in model.properties:
                 if not prop.definition.is_primitive:
-                    deps.update(self.get_model_dependencies(prop.definition))
-                    for a in prop.definition.ancestors():
-                        deps.add(a.full_name_path)
+                    deps.update(self.__model_dependencies(prop.definition))
+                    deps.update(self.__ancestor_paths(prop.definition))
                 if (
                     isinstance(prop.definition, ListNode)
                     and not prop.definition.item_type.is_primitive
                 ):
-                    deps.update(self.get_model_dependencies(prop.definition.item_type))
+                    deps.update(self.__model_dependencies(prop.definition.item_type))
         elif isinstance(model, ListNode) and not model.item_type.is_primitive:
-            deps.update(self.get_model_dependencies(model.item_type))
+            deps.update(self.__model_dependencies(model.item_type))
         if isinstance(model, ReferenceNode) and model.parent is not None:
             deps.add(model.full_name_path)
         else:
             deps.discard(model.full_name_path)
 
-        return list(deps)
+        deps = frozenset(deps)
+        self.__dependencies_cache[model] = deps
+        return deps
+
+    def __ancestor_paths(self, model: Definition) -> FrozenSet[str]:
+        if model in self.__ancestor_paths_cache:
+            return self.__ancestor_paths_cache[model]
+        # References answer ancestors() for the definition that they refer to, so this cannot be built up from the parent
+        paths = frozenset(a.full_name_path for a in model.ancestors())
+        self.__ancestor_paths_cache[model] = paths
+        return paths
 
     def process(self, json_schema):
-        if "definitions" in json_schema:
-            for _obj_name, _obj in json_schema["definitions"].items():
-                model = self.definition_parser(_obj_name, _obj)
-                self.definitions.append(model)
-
-            # topological ordered dependencies
-            g = networkx.DiGraph()
-            models_map = {}
-            for model in self.definitions:
-                models_map[model.full_name_path] = model
-                deps = self.get_model_dependencies(model)
-                if not deps:
-                    g.add_edge(model.full_name_path, "")
-                for dep in deps:
-                    g.add_edge(model.full_name_path, dep)
-
-            self.definitions = []
-            if self.generate_definitions:
-                # use lexicographical topo sort so that the generation order is stable
-                for model_name in networkx.lexicographical_topological_sort(g):
-                    if model_name in models_map:
-                        # insert to front so that the sorting is reversed
-                        self.definitions.insert(0, models_map[model_name])
+        if any(k in json_schema for k in DEFINITION_KEYWORDS):
+            self.process_definitions(
+                item
+                for k in DEFINITION_KEYWORDS
+                if k in json_schema
+                for item in json_schema[k].items()
+            )
+        self.process_root(json_schema)
 
+    def process_stream(self, json_schema_file):
+        """
+        Process a schema while it is being parsed so that each definition is released as soon as it has been turned
+        into a Definition, instead of holding the entire document in memory along with all the Definitions
+        """
+        root = {}
+        for path, value in iter_schema(json_schema_file):
+            if len(path) == 2:
+                self.add_definition(path[1], value)
+            elif path[0] in DEFINITION_KEYWORDS:
+                for _obj_name, _obj in value.items():
+                    self.add_definition(_obj_name, _obj)
+            else:
+                root[path[0]] = value
+        # Ordering nothing leaves nothing, so this is the same as process() even when there are no definitions
+        self.order_definitions()
+        self.process_root(root)
+
+    def process_definitions(self, definitions: Iterable[Tuple[str, dict]]):
+        for _obj_name, _obj in definitions:
+            self.add_definition(_obj_name, _obj)
+        self.order_definitions()
+
+    def add_definition(self, _obj_name, _obj):
+        model = self.definition_parser(_obj_name, _obj)
+        self.definitions.append(model)
+        self.index_definition(model)
+
+    def order_definitions(self):
+        # topological ordered dependencies
+        self.__dependencies_cache = {}
+        self.__ancestor_paths_cache = {}
+        graph: Dict[str, Set[str]] = {}
+        models_map = {}
+        for model in self.definitions:
+            models_map[model.full_name_path] = model
+            graph.setdefault(model.full_name_path, set()).update(
+                self.__model_dependencies(model)
+            )
+        self.__dependencies_cache = {}
+        self.__ancestor_paths_cache = {}
+
+        self.definitions = []
+        if self.generate_definitions:
+            # use lexicographical topo sort so that the generation order is stable
+            self.definitions = [
+                models_map[model_name]
+                for model_name in self.topological_sort(graph)
+                if model_name in models_map
+            ]
+            # reverse so that dependencies come before the models which use them
+            self.definitions.reverse()
+
+    def process_root(self, json_schema):
         # create root object if there are some properties in the root
         if "title" in json_schema:
             root_object_name = "".join(
@@ -178,12 +429,56 @@ class JsonSchema2Popo:
             )
         else:
             root_object_name = "RootObject"
+        self.document_roots[self.document_path] = root_object_name
+        # References into the root object which were seen before its name was known can now be searched for by name
+        placeholder = self.__root_placeholder(self.document_path)
+        for name in [
+            n
+            for n in self.searching_for_references
+            if n == placeholder or n.startswith(placeholder + ".")
+        ]:
+            self.searching_for_references[
+                root_object_name + name[len(placeholder) :]
+            ].update(self.searching_for_references.pop(name))
         if self.generate_root:
             root_model = self.definition_parser(root_object_name, json_schema)
             if root_model is None:
                 root_model = ObjectNode(name=root_object_name)
+            self.index_definition(root_model)
             self.definitions.append(root_model)
 
+    @staticmethod
+    def __root_placeholder(document_path: Optional[str]) -> str:
+        return "\0{}".format(document_path or "")
+
+    def process_file(self, path: str) -> dict:
+        """
+        Process the schema in another file unless it has already been processed for this schema
+        """
+        path = os.path.abspath(path)
+        if path not in self.processed_files:
+            self.loaded_files.append(path)
+            # Record it before processing so that files which refer to each other don't recurse forever
+            self.processed_files[path] = self.document_cache.load(path)
+            previous, self.document_path = self.document_path, path
+            try:
+                self.process(self.processed_files[path])
+            finally:
+                self.document_path = previous
+        return self.processed_files[path]
+
+    def topological_sort(self, graph: Dict[str, Set[str]]) -> List[str]:
+        if not self.use_networkx:
+            return lexicographical_topological_sort(graph)
+
+        import networkx
+
+        g = networkx.DiGraph()
+        for node, edges in graph.items():
+            g.add_node(node)
+            g.add_edges_from((node, e) for e in edges)
+        return list(networkx.lexicographical_topological_sort(g))
+
     def attach_extra_bits(self, _obj, model: Definition):
         if "$ref" in _obj:
             self.attach_ref_value(_obj["$ref"], model)
@@ -192,6 +487,8 @@ class JsonSchema2Popo:
         ) and model.full_name_path in self.searching_for_references:
             for m in self.searching_for_references[model.full_name_path]:
                 m.value = model
+                if m.parent is None:
+                    self.index_definition(m)
             del self.searching_for_references[model.full_name_path]
 
         if "description" in _obj:
@@ -204,40 +501,62 @@ class JsonSchema2Popo:
             and model.parent is not None
         ):
             model.parent.children.add(model)
+            self.index_definition(model)
+
+    def index_definition(self, model: Definition):
+        if model is None or (isinstance(model, ReferenceNode) and model.value is None):
+            return
+        # Keep the first definition registered for a path, matching the order that the definitions are searched in
+        self.definitions_index.setdefault(model.full_name_path, model)
 
     def attach_ref_value(self, ref: str, model: Definition):
         if isinstance(model, ReferenceNode) and model.value is None:
-            # Only supporting "#/definitions/"
-            ref_path = ref.split("/")[2:]
-            ref = ".".join(ref_path)
-            # Add to search list so that it is filled in at a later time
-            self.searching_for_references[ref].add(model)
+            # ref_lookup has already warned about the reference if it isn't supported
+            name_path = self.ref_name_path(ref, warn=False)
+            if name_path is not None:
+                # Add to search list so that it is filled in at a later time
+                self.searching_for_references[name_path].add(model)
 
     def ref_lookup(self, ref) -> Optional[Definition]:
-        if not ref.startswith("#/definitions/"):
-            logger.warning(
-                "References to anything other than #/definitions/ are not supported %s",
-                ref,
-            )
+        name_path = self.ref_name_path(ref)
+        if name_path is None:
             return None
+        return self.definitions_index.get(name_path)
 
-        ref_path = ref.split("/")[2:]
-        ref = ".".join(ref_path)
-
-        def search(m: Definition, ref):
-            if m.full_name_path == ref:
-                return m
-            for mo in m.children:
-                found = search(mo, ref)
-                if found is not None:
-                    return found
+    def ref_name_path(self, ref: str, warn: bool = True) -> Optional[str]:
+        """
+        Resolve a reference to the full name path of the definition which it points to, processing the file which
+        it refers to if that hasn't been done yet. Logs why when it returns None, unless warn is False.
+        """
+        log = logger.warning if warn else logger.debug
+        split = split_ref(ref)
+        if split is None or "://" in split[0]:
+            log("Only JSON Pointer references within local files are supported %s", ref)
             return None
-
-        for model in self.definitions:
-            found = search(model, ref)
-            if found is not None:
-                return found
-        return None
+        file, tokens = split
+        document = self.document_path
+        if file:
+            directory = os.path.dirname(document) if document else ""
+            document = os.path.abspath(os.path.join(directory, file))
+            if document != self.document_path:
+                try:
+                    self.process_file(document)
+                except (OSError, ValueError) as e:
+                    log("Unable to load %s referenced by %s: %s", file, ref, e)
+                    return None
+        names = pointer_names(tokens)
+        if names is None:
+            log(
+                "References to anything other than definitions, $defs, or the root object are not supported %s",
+                ref,
+            )
+            return None
+        if names[0] is None:
+            # The root object's name comes from its title, which might not have been read yet
+            names[0] = self.document_roots.get(document)
+            if names[0] is None:
+                names[0] = self.__root_placeholder(document)
+        return ".".join(names)
 
     def definition_parser(
         self, _obj_name, _obj, parent: Definition = None
@@ -267,10 +586,8 @@ class JsonSchema2Popo:
 
         if "extends" in _obj and "$ref" in _obj["extends"]:
             if _obj["extends"]["$ref"].endswith(".json"):
-                with open(_obj["extends"]["$ref"], "r") as f:
-                    ref_file = json.load(f)
-                    self.process(ref_file)
-                    model.extends = self.ref_lookup(ref_file["title"])
+                ref_file = self.process_file(_obj["extends"]["$ref"])
+                model.extends = self.ref_lookup(ref_file["title"])
             else:
                 model.extends = self.ref_lookup(_obj["extends"]["$ref"])
 
@@ -405,15 +722,40 @@ class JsonSchema2Popo:
         return model
 
     def write_file(self, filename):
-        template = self.custom_template or self.module.template()
-        self.jinja.get_template(template).stream(
-            models=self.definitions,
+        if self.module.writes_directory():
+            if hasattr(filename, "write"):
+                raise ValueError(
+                    "{} writes a directory, so the output must be a path".format(
+                        self.module.plugin_name()
+                    )
+                )
+            self.module.write_directory(self, filename)
+            return
+        code = self.render_code()
+        if hasattr(filename, "write"):
+            filename.write(code)
+        else:
+            with open(filename, "wb") as f:
+                f.write(code.encode("utf-8"))
+        if hasattr(filename, "close"):
+            filename.close()
+
+    def render_code(self, models=None, template=None, **inputs) -> str:
+        """
+        Render the template, by default the custom or plugin template, for models, by default all of the definitions,
+        and format it. Keyword arguments are passed to the template, replacing the usual inputs of the same name.
+        """
+        template = template or self.custom_template or self.module.template()
+        context = dict(
+            models=self.definitions if models is None else models,
             enum_used=self.enum_used,
             list_used=self.list_used,
             **self.module.extra_jinja_inputs()
-        ).dump(filename)
-        if hasattr(filename, "close"):
-            filename.close()
+        )
+        context.update(inputs)
+        code = self.jinja.get_template(template).render(**context)
+        # Format in memory so that the file is only written once
+        return self.module.format_code(code)
 
     def maybe_translate_property_name(self, name):
         name = name.replace("-", "_").replace(".", "_")
@@ -429,6 +771,47 @@ class JsonSchema2Popo:
     def after_generation(self, filename=None):
         self.module.after_generation(filename=filename)
 
+    def after_batch_generation(self, filenames: List[str]):
+        self.module.after_batch_generation(filenames=filenames)
+
+    def template_file(self) -> str:
+        template = self.custom_template or self.module.template()
+        return self.jinja.loader.get_source(self.jinja, template)[1]
+
+    def template_files(self) -> List[str]:
+        """
+        Paths of the template and of any other templates that the plugin uses
+        """
+        return [self.template_file()] + [
+            self.jinja.loader.get_source(self.jinja, t)[1]
+            for t in self.module.extra_templates()
+        ]
+
+    def generation_options(self) -> str:
+        """
+        Everything other than the schema which affects the generated code, such as the template source, plugin, and
+        options, as a string
+        """
+        template = self.custom_template or self.module.template()
+        source = self.jinja.loader.get_source(self.jinja, template)[0]
+        return json.dumps(
+            {
+                "version": __version__,
+                "plugin": [self.module.plugin_name(), self.module.plugin_version()],
+                "template": [template, source],
+                "extra_templates": [
+                    [t, self.jinja.loader.get_source(self.jinja, t)[0]]
+                    for t in self.module.extra_templates()
+                ],
+                "generate_definitions": self.generate_definitions,
+                "generate_root": self.generate_root,
+                "translate_properties": self.translate_properties,
+                "plugin_options": self.module.extra_jinja_inputs(),
+            },
+            sort_keys=True,
+            default=str,
+        )
+
     def update_args(self, args):
         if "no_generate_from_definitions" in args:
             self.generate_definitions = args.no_generate_from_definitions
@@ -440,6 +823,83 @@ class JsonSchema2Popo:
         self.module.set_args(args)
 
 
+class GenerationCache:
+    """
+    Manifest recording what each output file was generated from so that generating it again can be skipped when
+    nothing has changed. The key covers the schema, any files that it extends, the template, the plugin, and all the
+    generation options.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: Dict[str, dict] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable cache %s: %s", path, e)
+
+    @staticmethod
+    def hash_file(path: str) -> Optional[str]:
+        if os.path.isdir(path):
+            # Plugins which write a directory are up to date when every file in it is, ignoring bytecode written by
+            # importing the output
+            digest = hashlib.sha256()
+            for root, dirs, files in os.walk(path):
+                dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+                for name in sorted(files):
+                    file = os.path.join(root, name)
+                    digest.update(os.path.relpath(file, path).encode("utf-8"))
+                    digest.update(str(GenerationCache.hash_file(file)).encode("utf-8"))
+            return digest.hexdigest()
+        try:
+            with open(path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+
+    @staticmethod
+    def key(loader: JsonSchema2Popo, schema: str, files: List[str]) -> str:
+        h = hashlib.sha256()
+        h.update(schema.encode("utf-8"))
+        for file in files:
+            h.update(file.encode("utf-8"))
+            h.update(str(GenerationCache.hash_file(file)).encode("utf-8"))
+        h.update(loader.generation_options().encode("utf-8"))
+        return h.hexdigest()
+
+    def is_current(self, loader: JsonSchema2Popo, schema: str, output: str) -> bool:
+        entry = self.entries.get(os.path.abspath(output))
+        if entry is None:
+            return False
+        # Also regenerate if the output was changed or deleted since it was generated
+        return entry["output"] == GenerationCache.hash_file(output) and entry[
+            "key"
+        ] == GenerationCache.key(loader, schema, entry["files"])
+
+    @staticmethod
+    def record(loader: JsonSchema2Popo, schema: str) -> dict:
+        return {
+            "key": GenerationCache.key(loader, schema, loader.loaded_files),
+            "files": loader.loaded_files,
+        }
+
+    def files(self, output: str) -> List[str]:
+        entry = self.entries.get(os.path.abspath(output))
+        return entry["files"] if entry is not None else []
+
+    def update(self, output: str, record: dict):
+        # Hash the output once it is in its final form, after any formatting
+        self.entries[os.path.abspath(output)] = dict(
+            record, output=GenerationCache.hash_file(output)
+        )
+
+    def save(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=2, sort_keys=True)
+
+
 def init_parser():
     parser = argparse.ArgumentParser(
         description="Converts JSON Schema to Plain Old Python Object"
@@ -447,15 +907,22 @@ def init_parser():
     parser.add_argument(
         "json_schema_file",
         type=argparse.FileType("r", encoding="utf-8"),
+        nargs="?",
         help="Path to JSON Schema file to load",
     )
     parser.add_argument(
         "-o",
         "--output-file",
-        type=argparse.FileType("w", encoding="utf-8"),
         help="Path to file output",
         default="model.py",
     )
+    parser.add_argument(
+        "-b",
+        "--batch",
+        type=argparse.FileType("r", encoding="utf-8"),
+        help='Path to a JSON manifest of schemas to generate, formatted as [{"schema": "<path>", "output": "<path>"}]. '
+        "All schemas are generated with the same options in a single process.",
+    )
     parser.add_argument(
         "-jt",
         "--custom-template",
@@ -486,6 +953,38 @@ def init_parser():
         help="Which language to generate in. Use python, js, go, or enter in a Python module name to use a plugin",
         default="python",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of processes to generate the schemas of a --batch manifest with. Default is 1.",
+        default=1,
+    )
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help="Keep running and generate again whenever the schema, a file that it extends, or the template changes.",
+    )
+    parser.add_argument(
+        "--incremental",
+        metavar="CACHE_FILE",
+        help="Path to a file recording what each output was generated from. Outputs whose schema, template, plugin, "
+        "and options haven't changed since they were recorded are left untouched.",
+        default=None,
+    )
+    parser.add_argument(
+        "--no-template-cache",
+        dest="template_cache",
+        action="store_false",
+        help="Don't cache compiled templates on disk.",
+        default=True,
+    )
+    parser.add_argument(
+        "--template-cache-dir",
+        help="Directory to cache compiled templates in. Default is $XDG_CACHE_HOME/jsonschema2popo2.",
+        default=None,
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -513,10 +1012,13 @@ def main():
 
     args = parser.parse_known_args(args=rewritten_args)[0]
 
-    loader = JsonSchema2Popo(
+    loader_options = dict(
         language=args.language,
         custom_template=args.custom_template,
+        template_cache=args.template_cache,
+        template_cache_dir=args.template_cache_dir,
     )
+    loader = JsonSchema2Popo(**loader_options)
     loader.module.command_line_parser(
         sub_parser=parser.add_argument_group(loader.module.plugin_name())
     )
@@ -529,12 +1031,228 @@ def main():
             break
 
     args = parser.parse_args()
+    if args.batch is None and args.json_schema_file is None:
+        parser.error("either json_schema_file or --batch is required")
+    if args.batch is not None and args.json_schema_file is not None:
+        parser.error("--batch cannot be used with json_schema_file")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
     loader.update_args(args)
-    loader.load(args.json_schema_file)
+    if (
+        args.output_file == "-"
+        and args.batch is None
+        and loader.module.writes_directory()
+    ):
+        parser.error("the output must be a directory, not stdout")
+
+    cache = GenerationCache(args.incremental) if args.incremental else None
+    if args.watch:
+        if args.batch is not None:
+            with args.batch as f:
+                entries = [(e["schema"], e["output"]) for e in json.load(f)]
+        elif args.json_schema_file is sys.stdin:
+            parser.error("--watch cannot read the schema from stdin")
+        else:
+            args.json_schema_file.close()
+            entries = [(args.json_schema_file.name, args.output_file)]
+        watch(loader, entries, cache)
+        return
+
+    generated: List[Tuple[str, dict]] = []
+    try:
+        if args.batch is not None:
+            with args.batch as f:
+                manifest = json.load(f)
+            if args.jobs > 1:
+                generate_in_parallel(loader_options, args, manifest, cache, generated)
+            else:
+                # Like generate_in_parallel, generate every entry and then fail with the first error in manifest order
+                errors = []
+                for entry in manifest:
+                    try:
+                        with open(
+                            entry["schema"], "r", encoding="utf-8"
+                        ) as schema_file:
+                            record = generate(
+                                loader, schema_file, entry["output"], cache
+                            )
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    if record is not None:
+                        generated.append((entry["output"], record))
+                if errors:
+                    raise errors[0]
+        else:
+            record = generate(loader, args.json_schema_file, args.output_file, cache)
+            if record is not None:
+                generated.append((args.output_file, record))
+    finally:
+        finish_generation(loader, generated, cache)
+
+
+def finish_generation(
+    loader: JsonSchema2Popo,
+    generated: List[Tuple[str, dict]],
+    cache: Optional[GenerationCache] = None,
+):
+    """
+    Let the plugin handle all the generated files at once, then record the final outputs in the cache
+    """
+    if generated:
+        loader.after_batch_generation(filenames=[output for output, _ in generated])
+    if cache is not None:
+        for output, record in generated:
+            cache.update(output, record)
+        cache.save()
+
+
+def _mtime(path: str) -> Optional[float]:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
 
-    outfile = args.output_file
-    loader.write_file(outfile)
-    loader.after_generation(filename=outfile.name)
+def watch(
+    loader: JsonSchema2Popo,
+    entries: List[Tuple[str, str]],
+    cache: Optional[GenerationCache] = None,
+):
+    """
+    Generate each schema and then keep generating it again whenever the schema, a file that it extends, or the
+    template changes until interrupted. The same loader, and so the same plugin and compiled templates, is used
+    throughout.
+    """
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    template_files = loader.template_files()
+    # Modification times of everything that each schema was last generated from
+    watched: Dict[str, Dict[str, Optional[float]]] = {}
+    logger.info("Watching for changes, press Ctrl+C to stop")
+    try:
+        while True:
+            for schema, output in entries:
+                files = watched.get(schema)
+                if files is not None and all(_mtime(f) == m for f, m in files.items()):
+                    continue
+
+                files = {schema: _mtime(schema)}
+                files.update((t, _mtime(t)) for t in template_files)
+                record = None
+                start = time.perf_counter()
+                try:
+                    with open(schema, "r", encoding="utf-8") as schema_file:
+                        record = generate(loader, schema_file, output, cache)
+                    finish_generation(
+                        loader, [(output, record)] if record is not None else [], cache
+                    )
+                    logger.info(
+                        "Generated %s in %.0fms",
+                        output,
+                        (time.perf_counter() - start) * 1000,
+                    )
+                except Exception:
+                    # Keep watching so that the next save can fix whatever went wrong, such as half written JSON
+                    logger.exception("Failed to generate %s", output)
+                extends_files = loader.loaded_files
+                if cache is not None and record is None:
+                    # Nothing was loaded because the output was up to date, so use what the cache knows it depends on
+                    extends_files = cache.files(output)
+                files.update((f, _mtime(f)) for f in extends_files)
+                watched[schema] = files
+            time.sleep(WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+
+
+def generate(
+    loader: JsonSchema2Popo,
+    json_schema_file,
+    output: str,
+    cache: Optional[GenerationCache] = None,
+) -> Optional[dict]:
+    """
+    Generate code for a schema into the output path. When a cache is provided then nothing is done if the cache says
+    that the output is up to date.
+
+    :return: None if no file was written, because it was up to date or the output went to stdout. Otherwise, the
+        record to pass to finish_generation.
+    """
+    loader.reset()
+    if cache is None:
+        # Nothing needs the text of the schema, so it can be parsed as it is read
+        schema = None
+        loader.load(json_schema_file)
+    else:
+        schema = json_schema_file.read()
+        if cache.is_current(loader, schema, output):
+            logger.info("%s is up to date", output)
+            return None
+        loader.load(io.StringIO(schema), path=getattr(json_schema_file, "name", None))
+    if output == "-":
+        loader.write_file(sys.stdout)
+        loader.after_generation(filename=sys.stdout.name)
+        return None
+    if loader.module.writes_directory():
+        loader.write_file(output)
+    else:
+        loader.write_file(open(output, "w", encoding="utf-8"))
+    # finish_generation calls after_batch_generation with every output of the run instead of after_generation
+    return GenerationCache.record(loader, schema) if cache is not None else {}
+
+
+# Each worker process keeps one loader, with its plugin and compiled templates, for all of the schemas it generates
+_worker_loader: Optional[JsonSchema2Popo] = None
+
+
+def _init_worker(loader_options: dict, args: argparse.Namespace):
+    global _worker_loader
+    _worker_loader = JsonSchema2Popo(**loader_options)
+    _worker_loader.update_args(args)
+
+
+def _generate_in_worker(
+    schema: str, output: str, cache: Optional[GenerationCache]
+) -> Optional[dict]:
+    with open(schema, "r", encoding="utf-8") as schema_file:
+        return generate(_worker_loader, schema_file, output, cache)
+
+
+def generate_in_parallel(
+    loader_options: dict,
+    args: argparse.Namespace,
+    manifest,
+    cache: Optional[GenerationCache],
+    generated: List[Tuple[str, dict]],
+):
+    # Open files can't be sent to the workers, and the workers don't need them anyway
+    worker_args = argparse.Namespace(
+        **{
+            k: v
+            for k, v in vars(args).items()
+            if k not in ("json_schema_file", "output_file", "batch")
+        }
+    )
+    with ProcessPoolExecutor(
+        max_workers=args.jobs,
+        initializer=_init_worker,
+        initargs=(loader_options, worker_args),
+    ) as executor:
+        futures = [
+            executor.submit(
+                _generate_in_worker, entry["schema"], entry["output"], cache
+            )
+            for entry in manifest
+        ]
+        # Wait for everything before reporting so that the outcome doesn't depend on which worker finishes first,
+        # then fail with the first error in manifest order
+        errors = [f.exception() for f in futures]
+    for entry, f, e in zip(manifest, futures, errors):
+        if e is None and f.result() is not None:
+            generated.append((entry["output"], f.result()))
+    for e in errors:
+        if e is not None:
+            raise e
 
 
 if __name__ == "__main__":
@@ -1,12 +1,26 @@
 import argparse
+import ast
+import keyword
 import os
 import pathlib
-from typing import Union, Dict, Callable, Any
+import re
+from typing import Union, Dict, Callable, Any, Optional, List, Set
 
 from jsonschema2popo import version
-from jsonschema2popo.classes import Definition, ListNode, CodeGenPlugin
+from jsonschema2popo.classes import (
+    Definition,
+    ListNode,
+    CodeGenPlugin,
+    Property,
+    ReferenceNode,
+)
 from jsonschema2popo.jsonschema2popo import string_to_type
 
+HELPERS_TEMPLATE = "python_helpers.tmpl"
+PACKAGE_TEMPLATE = "python_package.tmpl"
+# Module of a package generated with --module-per-definition which the helpers that every module uses are written to
+HELPERS_MODULE = "_helpers"
+
 
 class Python(CodeGenPlugin):
     def plugin_name(self) -> str:
@@ -31,6 +45,58 @@ class Python(CodeGenPlugin):
             action="store_true",
             help="Generate class with __slots__",
         )
+        sub_parser.add_argument(
+            "--direct-attributes",
+            action="store_true",
+            help="Generate slotted classes with plain attributes instead of properties. Types are only checked by the "
+            "constructor and from_dict with --constructor-type-check",
+        )
+        sub_parser.add_argument(
+            "--named-tuples",
+            action="store_true",
+            help="Generate immutable typing.NamedTuple records instead of classes. Lists are stored as tuples and the "
+            "fields of extended records are copied into the records which extend them",
+        )
+        sub_parser.add_argument(
+            "--lazy-decoding",
+            action="store_true",
+            help="Make from_dict keep nested objects as they are and only decode them the first time they are read. "
+            "Not used with --direct-attributes or --named-tuples",
+        )
+        sub_parser.add_argument(
+            "--validation",
+            action="store_true",
+            help="Generate a validate method which checks the type, minimum, maximum, minLength, maxLength, minItems, "
+            "maxItems, pattern, and required validations of every field, and nested objects. Pass validate=True to "
+            "from_dict to call it",
+        )
+        sub_parser.add_argument(
+            "--enum-mixins",
+            action="store_true",
+            help="Generate integer enums as enum.IntEnum and string and number enums with str and float mixins, so "
+            "that their members are the values themselves and as_dict returns them as they are. Number enums with "
+            "integer values are left as plain enums",
+        )
+        sub_parser.add_argument(
+            "--base64-bytes",
+            action="store_true",
+            help="Make from_dict accept base64 strings for bytes fields, and only decode them the first time they are "
+            "read. as_dict returns base64 strings, passing through any which were never read. Also accept bytearray "
+            "and memoryview values for bytes fields. Fields are decoded by from_dict with --direct-attributes or "
+            "--named-tuples",
+        )
+        sub_parser.add_argument(
+            "--module-per-definition",
+            action="store_true",
+            help="Treat the output path as a package directory, and write each top-level definition to its own module "
+            "which imports only the modules it depends on. The package __init__.py imports classes the first time they "
+            "are used",
+        )
+        sub_parser.add_argument(
+            "--json-methods",
+            action="store_true",
+            help="Generate to_json and from_json methods, which use orjson when it is installed",
+        )
 
     def set_args(self, args):
         self.use_slots = args.use_slots if "use_slots" in args else False
@@ -38,25 +104,235 @@ class Python(CodeGenPlugin):
             args.constructor_type_check if "constructor_type_check" in args else None
         )
         self.use_types = args.use_types if "use_types" in args else False
+        self.json_methods = args.json_methods if "json_methods" in args else False
+        self.validation = args.validation if "validation" in args else False
+        self.direct_attributes = (
+            args.direct_attributes if "direct_attributes" in args else False
+        )
+        self.named_tuples = args.named_tuples if "named_tuples" in args else False
+        self.enum_mixins = args.enum_mixins if "enum_mixins" in args else False
+        self.module_per_definition = (
+            args.module_per_definition if "module_per_definition" in args else False
+        )
+        self.base64_bytes = args.base64_bytes if "base64_bytes" in args else False
+        # Decoding happens in the property getters, which the other styles don't have
+        self.lazy_decoding = (
+            args.lazy_decoding if "lazy_decoding" in args else False
+        ) and not (self.direct_attributes or self.named_tuples)
+        self.lazy_bytes = self.base64_bytes and not (
+            self.direct_attributes or self.named_tuples
+        )
 
     def extra_jinja_inputs(self) -> Dict[str, Any]:
         return {
             "use_slots": self.use_slots,
             "constructor_type_check": self.constructor_type_check,
             "use_types": self.use_types,
+            "json_methods": self.json_methods,
+            "validation": self.validation,
+            "direct_attributes": self.direct_attributes,
+            "named_tuples": self.named_tuples,
+            "lazy_decoding": self.lazy_decoding,
+            "enum_mixins": self.enum_mixins,
+            "base64_bytes": self.base64_bytes,
+            "lazy_bytes": self.lazy_bytes,
+            "module_per_definition": self.module_per_definition,
         }
 
     def template(self) -> str:
         return "python_class.tmpl"
 
+    def extra_templates(self) -> List[str]:
+        return [HELPERS_TEMPLATE, PACKAGE_TEMPLATE]
+
     def jinja_globals(self) -> Dict[str, Callable]:
-        return {"python_type": Python.python_type}
+        return {
+            "python_type": Python.python_type,
+            "has_from_dict": Python.has_from_dict,
+            "inherited_properties": Python.inherited_properties,
+            "decodes_lazily": Python.decodes_lazily,
+            "python_literal": repr,
+            "enum_member_name": Python.enum_member_name,
+            "members_name": Python.members_name,
+            "enum_mixin": Python.enum_mixin,
+        }
 
     def template_search_path(self) -> str:
         return os.path.dirname(os.path.abspath(__file__))
 
-    def after_generation(self, filename=None):
-        Python.format_python_file(filename=filename)
+    def format_code(self, code: str) -> str:
+        return Python.format_python_code(code)
+
+    def writes_directory(self) -> bool:
+        return self.module_per_definition
+
+    def write_directory(self, loader, directory: str) -> None:
+        os.makedirs(directory, exist_ok=True)
+        # Modules written by the last generation, which are deleted if their definitions have since been removed
+        stale = Python.package_modules(directory)
+        modules = Python.module_names(loader.definitions)
+        by_path = {model.full_name_path: model for model in loader.definitions}
+        dependencies = []
+        for model in loader.definitions:
+            # Enum tables which the module defines itself, such as those of a copied definition, aren't imported
+            defined = {
+                Python.members_name(v) for v in Python.walk(model) if v.type == "enum"
+            }
+            imports = []
+            for path in sorted(Python.module_dependencies(loader, model)):
+                dependency = by_path.get(path)
+                if dependency is None or dependency is model:
+                    continue
+                # Enums are decoded with their lookup tables, which live in the same module as the enum. Records use the
+                # module level classes which nested records are hoisted to.
+                nested = set()
+                for v in Python.walk(dependency):
+                    if v.type == "enum":
+                        nested.add(Python.members_name(v))
+                    if self.named_tuples and v is not dependency:
+                        nested.add("_" + v.full_name_python_path().replace(".", "_"))
+                names = [dependency.python_type_name] + sorted(nested - defined)
+                imports.append((modules[dependency], names))
+            imports.sort()
+            if imports:
+                dependencies.append((modules[model], [module for module, _ in imports]))
+            nodes = list(Python.walk(model))
+            enum_used = any(v.type == "enum" for v in nodes)
+            code = loader.render_code(
+                models=[model],
+                imports=imports,
+                helpers=self.helper_names(enum_used),
+                helpers_module=HELPERS_MODULE,
+                enum_used=enum_used,
+                list_used=any(
+                    isinstance(prop.definition, ListNode)
+                    for v in nodes
+                    for prop in getattr(v, "properties", ())
+                ),
+            )
+            Python.write_code(os.path.join(directory, modules[model] + ".py"), code)
+            stale.discard(modules[model])
+
+        if self.helper_names(loader.enum_used):
+            code = loader.render_code(
+                models=[], template=HELPERS_TEMPLATE, standalone=True
+            )
+            Python.write_code(os.path.join(directory, HELPERS_MODULE + ".py"), code)
+            stale.discard(HELPERS_MODULE)
+        for module in stale:
+            try:
+                os.remove(os.path.join(directory, module + ".py"))
+            except FileNotFoundError:
+                pass
+
+        code = loader.render_code(
+            template=PACKAGE_TEMPLATE,
+            modules=[
+                (model.python_type_name, modules[model]) for model in loader.definitions
+            ],
+            dependencies=dependencies,
+        )
+        Python.write_code(os.path.join(directory, "__init__.py"), code)
+
+    def helper_names(self, enum_used: bool) -> List[str]:
+        """
+        Names from python_helpers.tmpl which a module uses, given whether it has enums
+        """
+        names = []
+        if enum_used:
+            names.append("_EnumMembers")
+        if self.lazy_decoding or self.lazy_bytes:
+            names.append("_Undecoded")
+        if self.named_tuples and (self.json_methods or self.base64_bytes):
+            names.append("_bytes_value")
+        if self.json_methods:
+            names.extend(["_json_dumps", "_json_loads"])
+        return names
+
+    @staticmethod
+    def write_code(filename: str, code: str):
+        with open(filename, "wb") as f:
+            f.write(code.encode("utf-8"))
+
+    @staticmethod
+    def walk(v: Definition):
+        """
+        v and every class nested within it
+        """
+        yield v
+        for child in v.children:
+            yield from Python.walk(child)
+
+    @staticmethod
+    def package_modules(directory: str) -> Set[str]:
+        """
+        Modules listed in _modules of the __init__.py of a package which was generated into directory before, along
+        with its helpers module. Other files in the directory weren't generated, so they're left alone.
+        """
+        try:
+            with open(
+                os.path.join(directory, "__init__.py"), "r", encoding="utf-8"
+            ) as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            return set()
+        for node in tree.body:
+            if (
+                isinstance(node, ast.Assign)
+                and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id == "_modules"
+            ):
+                try:
+                    modules = ast.literal_eval(node.value)
+                except ValueError:
+                    return set()
+                if not isinstance(modules, dict):
+                    return set()
+                # Only names of modules within the package, never paths elsewhere
+                return {
+                    m
+                    for m in modules.values()
+                    if isinstance(m, str) and m.isidentifier()
+                } | {HELPERS_MODULE}
+        return set()
+
+    @staticmethod
+    def module_names(definitions: List[Definition]) -> Dict[Definition, str]:
+        """
+        Name the module of each definition in snake_case. Module names never match a class name, since importing a
+        module sets it as an attribute of the package, which would hide the class of the same name.
+        """
+        taken = {model.python_type_name for model in definitions} | {HELPERS_MODULE}
+        modules = {}
+        for model in definitions:
+            name = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", model.python_type_name)
+            name = re.sub("([a-z0-9])([A-Z])", r"\1_\2", name).lower()
+            while name in taken or keyword.iskeyword(name):
+                name += "_"
+            taken.add(name)
+            modules[model] = name
+        return modules
+
+    @staticmethod
+    def module_dependencies(loader, model: Definition) -> Set[str]:
+        """
+        Paths of the definitions which the code of model uses, including the classes it and its nested classes extend,
+        and what those use since records copy the fields of the records they extend
+        """
+        dependencies = set(loader.get_model_dependencies(model))
+        if isinstance(model, ReferenceNode) and model.value is not None:
+            # An alias of another definition is generated as a copy of it, which uses what it refers to
+            dependencies.add(model.value.ancestors()[0].full_name_path)
+        seen = set()
+        for v in Python.walk(model):
+            parent = getattr(v, "extends", None)
+            while parent is not None and id(parent) not in seen:
+                seen.add(id(parent))
+                dependencies.add(parent.ancestors()[0].full_name_path)
+                dependencies.update(loader.get_model_dependencies(parent))
+                parent = getattr(parent, "extends", None)
+        return dependencies
 
     @staticmethod
     def python_type(v: Union[Definition, str], relative_to: Definition = None) -> str:
@@ -73,17 +349,77 @@ class Python(CodeGenPlugin):
             return string_to_type(v)
 
     @staticmethod
-    def format_python_file(filename):
+    def has_from_dict(v: Optional[Definition]) -> bool:
+        # Matches python_type, which names a generated class, with a from_dict, for anything else
+        return (
+            isinstance(v, Definition)
+            and not isinstance(v, ListNode)
+            and not v.is_primitive
+        )
+
+    @staticmethod
+    def decodes_lazily(v: Optional[Definition]) -> bool:
+        # Enums are cheap to decode, so only objects are worth keeping as they are until they're used
+        return Python.has_from_dict(v) and v.type == "object"
+
+    @staticmethod
+    def members_name(v: Definition) -> str:
+        return "_{}_members".format(v.full_name_python_path().replace(".", "_"))
+
+    @staticmethod
+    def enum_mixin(v: Definition) -> Optional[str]:
+        # Members of an enum with a mixin are converted to the mixin type, so number enums only get one when every value
+        # is already a float, and integer values don't become floats
+        if v.value_type.type == "integer":
+            return "int"
+        if v.value_type.type == "string":
+            return "str"
+        if v.value_type.type == "number" and all(
+            isinstance(value, float) for value in v.values.values()
+        ):
+            return "float"
+        return None
+
+    @staticmethod
+    def enum_member_name(name: Any) -> str:
+        # Values which can't be used as names, such as those of integer enums without javaEnumNames, are prefixed
+        name = str(name)
+        if name.isidentifier() and not keyword.iskeyword(name):
+            return name
+        return "VALUE_" + re.sub(r"\W", "_", name)
+
+    @staticmethod
+    def inherited_properties(v: Definition) -> List[Property]:
+        """
+        Properties of the classes which v extends, starting from the furthest ancestor
+        """
+        properties = []
+        seen = {id(v)}
+        parent = getattr(v, "extends", None)
+        while parent is not None and id(parent) not in seen:
+            seen.add(id(parent))
+            properties[:0] = parent.properties
+            parent = getattr(parent, "extends", None)
+        return properties
+
+    @staticmethod
+    def format_python_code(code: str) -> str:
         try:
             import black
 
-            black.format_file_in_place(
-                pathlib.Path(filename).absolute(),
-                fast=True,
+            return black.format_str(
+                code,
                 mode=black.FileMode(
                     line_length=88, target_versions={black.TargetVersion.PY33}
                 ),
-                write_back=black.WriteBack.YES,
             )
         except:
-            pass
+            return code
+
+    @staticmethod
+    def format_python_file(filename):
+        path = pathlib.Path(filename)
+        code = path.read_text(encoding="utf-8")
+        formatted = Python.format_python_code(code)
+        if formatted != code:
+            path.write_text(formatted, encoding="utf-8")
@@ -45,8 +45,12 @@ setup(
     keywords="python json-schema code-generator",
     license="MIT License",
     python_requires=">=3.4",
-    install_requires=["Jinja2>=2.11.3", "networkx==2.4"],
-    extras_require={"Format JS": ["jsbeautifier"], "Format Python": ["black"]},
+    install_requires=["Jinja2>=2.11.3"],
+    extras_require={
+        "Format JS": ["jsbeautifier"],
+        "Format Python": ["black"],
+        "Networkx Sort": ["networkx>=2.4"],
+    },
     packages=["jsonschema2popo"],
     package_data={"jsonschema2popo": ["*/*"]},
     include_package_data=True,
@@ -0,0 +1,11 @@
+//+build test_jsonschema2popo.test_definitions_with_nested_ref_ordering
+
+package test
+
+import (
+	"generated"
+)
+
+func Test() {
+	_ = generated.ZZZ{generated.AAAA_Child{0}}
+}
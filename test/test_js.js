@@ -152,6 +152,11 @@ f.test_jsonschema2popo_test_definitions_with_nested_refs = (filename) => {
     new foo.AAAA(0, new foo.ABcd._Child1._Child2(0, ["1"]));
 }
 
+f.test_jsonschema2popo_test_definitions_with_nested_ref_ordering = (filename) => {
+    const foo = require("./" + filename);
+    new foo.ZZZ(new foo.AAAA._Child(0));
+}
+
 f.test_jsonschema2popo_test_list_definitions_with_nested_object = (filename) => {
     const foo = require("./" + filename);
     new foo.A([new foo.A._sub1(0, 1.2)]);
@@ -1,17 +1,31 @@
 import argparse
 import importlib.util
+import io
 import json
 import os
 import subprocess
 import sys
+import tempfile
+import time
 import unittest
 from types import ModuleType
 
 import mypy.main
 from mypy.fscache import FileSystemCache
 
-from jsonschema2popo import jsonschema2popo
-from jsonschema2popo.go.go import Go
+from jsonschema2popo import jsonschema2popo, json_stream
+from jsonschema2popo.classes import (
+    ObjectNode,
+    ReferenceNode,
+    Property,
+    ListNode,
+    StringNode,
+    EnumNode,
+    NumericNode,
+    IntegerNode,
+    BooleanNode,
+    NullNode,
+)
 from jsonschema2popo.js.js import JS
 from jsonschema2popo.python.python import Python
 
@@ -51,6 +65,45 @@ def import_file(file_path: str) -> ModuleType:
     return foo
 
 
+def mypy_check(test: unittest.TestCase, *sources: mypy.main.BuildSource):
+    """
+    Make sure that the generated python typechecks successfully
+    """
+    messages = []
+
+    def flush_errors(new_messages, serious):
+        messages.extend(new_messages)
+
+    options = mypy.main.Options()
+    options.allow_untyped_globals = True
+    mypy.main.build.build(
+        list(sources),
+        options,
+        None,
+        flush_errors,
+        FileSystemCache(),
+        sys.stdout,
+        sys.stderr,
+    )
+    for m in messages:
+        print(m)
+    test.assertFalse(messages)
+
+
+def generate_python(test: unittest.TestCase, schema: dict, **options) -> ModuleType:
+    """
+    Generate python for schema with the plugin options, typecheck it, and import it
+    """
+    with tempfile.TemporaryDirectory() as d:
+        file_path = os.path.join(d, "model.py")
+        loader = jsonschema2popo.JsonSchema2Popo(language="python")
+        loader.update_args(argparse.Namespace(**options))
+        loader.process(schema)
+        loader.write_file(file_path)
+        mypy_check(test, mypy.main.BuildSource(path=file_path, module=""))
+        return import_file(file_path)
+
+
 class JsonSchema2Popo(unittest.TestCase):
     def tearDown(self):
         try:
@@ -88,28 +141,7 @@ class JsonSchema2Popo(unittest.TestCase):
         self.assertEqual(0, proc.returncode)
 
     def mypy_test(self):
-        """
-        Make sure that the generated python typechecks successfully
-        """
-        messages = []
-
-        def flush_errors(new_messages, serious):
-            messages.extend(new_messages)
-
-        options = mypy.main.Options()
-        options.allow_untyped_globals = True
-        mypy.main.build.build(
-            [mypy.main.BuildSource(path=self.test_file, module="")],
-            options,
-            None,
-            flush_errors,
-            FileSystemCache(),
-            sys.stdout,
-            sys.stderr,
-        )
-        for m in messages:
-            print(m)
-        self.assertFalse(messages)
+        mypy_check(self, mypy.main.BuildSource(path=self.test_file, module=""))
 
     def import_test_file(self):
         return import_file(self.test_file)
@@ -158,7 +190,7 @@ class JsonSchema2Popo(unittest.TestCase):
         )
         loader.process(json.loads(schema))
         loader.write_file(self.test_file_go)
-        Go.format_go_file(self.test_file_go)
+        loader.after_generation(filename=self.test_file_go)
 
     def test_root_basic_generation(self):
         self.generate_files(
@@ -424,6 +456,38 @@ class JsonSchema2Popo(unittest.TestCase):
         foo.Ref(IntVal=0, ListVal=["1"])
         foo.AAAA(X=0, YRef=foo.ABcd._Child1._Child2(IntVal=0, ListVal=["1"]))
 
+    def test_definitions_with_nested_ref_ordering(self):
+        self.generate_files(
+            """{
+            "definitions": {
+                "AAAA": {
+                    "type": "object",
+                    "properties": {
+                        "Child": {
+                            "type": "object",
+                            "properties": {
+                                "X": {
+                                    "type": "integer"
+                                }
+                            }
+                        }
+                    }
+                },
+                "ZZZ": {
+                    "type": "object",
+                    "properties": {
+                        "Ref": {
+                            "$ref": "#/definitions/AAAA/Child"
+                        }
+                    }
+                }
+            }
+        }"""
+        )
+
+        foo = self.import_test_file()
+        foo.ZZZ(Ref=foo.AAAA._Child(X=0))
+
     def test_list_definitions_with_nested_object(self):
         self.generate_files(
             """{
@@ -556,5 +620,1198 @@ class JsonSchema2Popo(unittest.TestCase):
         assert test("a", test._prop2.First).prop2 == test._prop2.First
 
 
+class TopologicalSort(unittest.TestCase):
+    def test_matches_networkx(self):
+        import networkx
+        import random
+
+        rand = random.Random(0)
+        nodes = ["N{}".format(i) for i in range(200)]
+        graph = {}
+        for i, n in enumerate(nodes):
+            graph[n] = set(rand.sample(nodes[i + 1 :], min(3, len(nodes) - i - 1)))
+        rand.shuffle(nodes)
+
+        g = networkx.DiGraph()
+        for n in nodes:
+            g.add_node(n)
+            g.add_edges_from((n, e) for e in graph[n])
+        self.assertEqual(
+            list(networkx.lexicographical_topological_sort(g)),
+            jsonschema2popo.lexicographical_topological_sort(
+                {n: graph[n] for n in nodes}
+            ),
+        )
+
+    def test_cycle(self):
+        self.assertRaisesRegex(
+            ValueError,
+            "circular dependency",
+            lambda: jsonschema2popo.lexicographical_topological_sort(
+                {"A": {"B"}, "B": {"A"}}
+            ),
+        )
+
+
+class Nodes(unittest.TestCase):
+    def test_cached_paths_are_recomputed(self):
+        a = ObjectNode(name="A")
+        b = ObjectNode(name="B")
+        child = ObjectNode(parent=a, name="Child")
+        ref = ReferenceNode(a)
+        self.assertEqual(["A", "Child"], child.names)
+        self.assertEqual("A.Child", child.full_name_path)
+        self.assertEqual("A._Child", child.full_name_python_path())
+        self.assertEqual("_Child", child.full_name_python_path(relative_to=ref))
+
+        child.name = "Renamed"
+        self.assertEqual(["A", "Renamed"], child.names)
+        self.assertEqual("A.Renamed", child.full_name_path)
+        self.assertEqual("A._Renamed", child.full_name_python_path())
+
+        child.parent = b
+        self.assertEqual(["B", "Renamed"], child.names)
+        self.assertEqual("B.Renamed", child.full_name_path)
+        self.assertEqual("B._Renamed", child.full_name_python_path())
+        self.assertEqual("B._Renamed", child.full_name_python_path(relative_to=ref))
+
+        # Paths relative to a reference depend on what it refers to
+        ref.value = b
+        self.assertEqual("_Renamed", child.full_name_python_path(relative_to=ref))
+
+        # Renaming an ancestor changes the paths of every node below it
+        b.name = "Other"
+        self.assertEqual(["Other", "Renamed"], child.names)
+        self.assertEqual("Other.Renamed", child.full_name_path)
+        self.assertEqual("Other._Renamed", child.full_name_python_path())
+
+    def test_reference_forwarding(self):
+        target = ObjectNode(name="Target")
+        target.comment = "The target"
+        ref = ReferenceNode(target, name="Ref")
+        self.assertEqual("object", ref.type)
+        self.assertIs(target.properties, ref.properties)
+        # The reference's own name and comment are never read from what it refers to
+        self.assertEqual("Ref", ref.name)
+        self.assertRaises(AttributeError, lambda: ref.comment)
+        ref.comment = "The reference"
+        self.assertEqual("The reference", ref.comment)
+        self.assertEqual("The target", target.comment)
+        # Neither are private attributes, or anything when the reference isn't resolved yet
+        self.assertRaises(AttributeError, lambda: ref._not_an_attribute)
+        self.assertRaises(AttributeError, lambda: ReferenceNode().properties)
+        # A reference to a reference forwards to what that one refers to
+        self.assertIs(target.properties, ReferenceNode(ref).properties)
+
+    def test_slots(self):
+        for node in (
+            ListNode(),
+            ObjectNode(),
+            StringNode(),
+            EnumNode(),
+            NumericNode(),
+            IntegerNode(),
+            BooleanNode(),
+            NullNode(),
+            ReferenceNode(),
+            Property(),
+        ):
+            self.assertFalse(hasattr(node, "__dict__"), type(node).__name__)
+
+            def set_unknown():
+                node.unknown = 1
+
+            self.assertRaises(AttributeError, set_unknown)
+
+    def test_children_are_created_when_used(self):
+        parent = ObjectNode(name="Parent")
+        leaf = ObjectNode(parent=parent, name="Leaf")
+        self.assertIsNone(leaf._children)
+        self.assertEqual(set(), leaf.children)
+        self.assertIs(leaf.children, leaf.children)
+        parent.children.add(leaf)
+        self.assertEqual({leaf}, parent.children)
+        # A reference shares the children of what it refers to, and only has its own while unresolved
+        ref = ReferenceNode(parent)
+        self.assertIs(parent.children, ref.children)
+        self.assertIsNone(ref._children)
+        self.assertEqual(set(), ReferenceNode().children)
+
+
+class TemplateCache(unittest.TestCase):
+    def render(self, cache_dir):
+        loader = jsonschema2popo.JsonSchema2Popo(
+            language="python", template_cache_dir=cache_dir
+        )
+        loader.update_args(argparse.Namespace())
+        loader.process(json.loads(DEFINITIONS_BASIC_GENERATION))
+        out = io.StringIO()
+        out.close = lambda: None
+        loader.write_file(out)
+        return out.getvalue()
+
+    def test_cached_template_renders_the_same(self):
+        with tempfile.TemporaryDirectory() as d:
+            cold = self.render(d)
+            self.assertTrue(os.listdir(d))
+            self.assertEqual(cold, self.render(d))
+
+
+class Batch(unittest.TestCase):
+    def run_main(self, *args):
+        argv = sys.argv
+        sys.argv = ["jsonschema2popo2", *args]
+        try:
+            jsonschema2popo.main()
+        finally:
+            sys.argv = argv
+
+    def test_batch_matches_separate_runs(self):
+        schemas = [
+            DEFINITIONS_BASIC_GENERATION,
+            """{
+                "title": "ABcd",
+                "type": "object",
+                "properties": {
+                    "StringEnum": {
+                        "type": "string",
+                        "enum": ["A", "b", "c"]
+                    },
+                    "List": {
+                        "type": "array",
+                        "items": {
+                            "type": "integer"
+                        }
+                    }
+                }
+            }""",
+        ]
+        with tempfile.TemporaryDirectory() as d:
+            manifest = []
+            for i, schema in enumerate(schemas):
+                with open(os.path.join(d, f"{i}.json"), "w") as f:
+                    f.write(schema)
+                manifest.append(
+                    {
+                        "schema": os.path.join(d, f"{i}.json"),
+                        "output": os.path.join(d, f"batch_{i}.py"),
+                    }
+                )
+                self.run_main(
+                    "-t",
+                    "-o",
+                    os.path.join(d, f"single_{i}.py"),
+                    manifest[-1]["schema"],
+                )
+            # An entry which fails must not stop the entries after it from being generated
+            with open(os.path.join(d, "invalid.json"), "w") as f:
+                f.write('{"definitions": {')
+            manifest.insert(
+                1,
+                {
+                    "schema": os.path.join(d, "invalid.json"),
+                    "output": os.path.join(d, "batch_invalid.py"),
+                },
+            )
+            with open(os.path.join(d, "manifest.json"), "w") as f:
+                json.dump(manifest, f)
+
+            for jobs in ("1", "2"):
+                with self.assertRaises(json.JSONDecodeError):
+                    self.run_main(
+                        "-t",
+                        "--batch",
+                        os.path.join(d, "manifest.json"),
+                        "--jobs",
+                        jobs,
+                    )
+                for i in range(len(schemas)):
+                    with open(os.path.join(d, f"single_{i}.py")) as single, open(
+                        os.path.join(d, f"batch_{i}.py")
+                    ) as batch:
+                        self.assertEqual(single.read(), batch.read())
+                    os.remove(os.path.join(d, f"batch_{i}.py"))
+
+
+class Incremental(unittest.TestCase):
+    run_main = Batch.run_main
+
+    def test_unchanged_output_is_skipped(self):
+        with tempfile.TemporaryDirectory() as d:
+            schema = os.path.join(d, "schema.json")
+            output = os.path.join(d, "model.py")
+            cache = os.path.join(d, "cache.json")
+            with open(schema, "w") as f:
+                f.write(DEFINITIONS_BASIC_GENERATION)
+
+            self.run_main("--incremental", cache, "-o", output, schema)
+            os.utime(output, (0, 0))
+            self.run_main("--incremental", cache, "-o", output, schema)
+            self.assertEqual(0, os.path.getmtime(output))
+
+            # Changing an option must generate again
+            self.run_main("--incremental", cache, "-t", "-o", output, schema)
+            self.assertNotEqual(0, os.path.getmtime(output))
+
+            # So must changing the output itself
+            with open(output, "w") as f:
+                f.write("")
+            self.run_main("--incremental", cache, "-t", "-o", output, schema)
+            with open(output) as f:
+                self.assertIn("class ABcd", f.read())
+
+
+class Watch(unittest.TestCase):
+    def wait_for(self, condition, timeout=30):
+        end = time.monotonic() + timeout
+        while time.monotonic() < end:
+            if condition():
+                return
+            time.sleep(0.05)
+        self.fail("Timed out waiting for generation")
+
+    def test_regenerates_on_change(self):
+        with tempfile.TemporaryDirectory() as d:
+            schema = os.path.join(d, "schema.json")
+            output = os.path.join(d, "model.py")
+            with open(schema, "w") as f:
+                f.write(DEFINITIONS_BASIC_GENERATION)
+
+            def output_contains(text):
+                try:
+                    with open(output) as f:
+                        return text in f.read()
+                except OSError:
+                    return False
+
+            proc = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "jsonschema2popo",
+                    "--watch",
+                    "-o",
+                    output,
+                    schema,
+                ],
+                cwd=os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                self.wait_for(lambda: output_contains("class ABcd"))
+                with open(schema, "w") as f:
+                    f.write(DEFINITIONS_BASIC_GENERATION.replace("ABcd", "Changed"))
+                self.wait_for(lambda: output_contains("class Changed"))
+            finally:
+                proc.terminate()
+                proc.wait()
+
+    def test_watches_every_template(self):
+        loader = jsonschema2popo.JsonSchema2Popo(language="python")
+        self.assertEqual(
+            ["python_class.tmpl", "python_helpers.tmpl", "python_package.tmpl"],
+            [os.path.basename(f) for f in loader.template_files()],
+        )
+
+
+class StreamingLoad(unittest.TestCase):
+    SCHEMA = {
+        "properties": {"Root": {"$ref": "#/definitions/B"}},
+        "definitions": json.loads(DEFINITIONS_BASIC_GENERATION)["definitions"],
+        "title": "Streamed",
+    }
+
+    def render(self, load):
+        loader = jsonschema2popo.JsonSchema2Popo(language="python")
+        loader.update_args(argparse.Namespace())
+        load(loader)
+        out = io.StringIO()
+        out.close = lambda: None
+        loader.write_file(out)
+        return out.getvalue()
+
+    def test_load_matches_process(self):
+        schema = dict(self.SCHEMA)
+        schema["definitions"] = dict(
+            schema["definitions"], B={"$ref": "#/definitions/ABcd"}
+        )
+        text = json.dumps(schema, indent=2)
+        self.assertEqual(
+            self.render(lambda l: l.process(json.loads(text))),
+            self.render(lambda l: l.load(io.StringIO(text))),
+        )
+
+    def test_small_chunks(self):
+        text = json.dumps(self.SCHEMA, indent=2)
+        for chunk_size in (1, 2, 7):
+            items = {}
+            stream = json_stream.iter_schema(io.StringIO(text), chunk_size)
+            for path, value in stream:
+                if len(path) == 2:
+                    items.setdefault(path[0], {})[path[1]] = value
+                else:
+                    items[path[0]] = value
+            self.assertEqual(self.SCHEMA, items)
+
+        # Numbers cut off by the end of a chunk, such as 12. or 12.5e, must not be taken as finished
+        text = '{"title":"X","minimum":12.5e3,"x":-1}'
+        for chunk_size in range(1, len(text) + 1):
+            self.assertEqual(
+                [(("title",), "X"), (("minimum",), 12.5e3), (("x",), -1)],
+                list(json_stream.iter_schema(io.StringIO(text), chunk_size)),
+            )
+
+    def test_invalid(self):
+        for text in ('{"a": 1', '{"a": 1}x', '{"a": 1,}', "[]"):
+            with self.assertRaises(json.JSONDecodeError):
+                list(json_stream.iter_schema(io.StringIO(text), 2))
+
+
+class ExtendsFile(unittest.TestCase):
+    def test_each_file_is_processed_once(self):
+        with tempfile.TemporaryDirectory() as d:
+            base = os.path.join(d, "base.json")
+            with open(base, "w") as f:
+                json.dump(
+                    {
+                        "title": "#/definitions/Base",
+                        "definitions": {
+                            "Base": {
+                                "type": "object",
+                                "properties": {"id": {"type": "integer"}},
+                            }
+                        },
+                    },
+                    f,
+                )
+            schema = {
+                "definitions": {
+                    name: {"type": "object", "extends": {"$ref": ref}}
+                    for name, ref in (
+                        ("A", base),
+                        ("B", os.path.join(d, ".", "base.json")),
+                    )
+                }
+            }
+
+            loader = jsonschema2popo.JsonSchema2Popo(language="python")
+            loader.process(schema)
+            names = [m.name for m in loader.definitions]
+            self.assertEqual(1, names.count("Base"))
+            self.assertEqual([base], loader.loaded_files)
+            by_name = {m.name: m for m in loader.definitions}
+            self.assertIs(by_name["Base"], by_name["A"].extends)
+            self.assertIs(by_name["Base"], by_name["B"].extends)
+
+            # The next schema processed by the same loader reuses the parsed file
+            document = loader.processed_files[base]
+            loader.reset()
+            loader.process(schema)
+            self.assertIs(document, loader.processed_files[base])
+            self.assertEqual(names, [m.name for m in loader.definitions])
+
+
+class References(unittest.TestCase):
+    def resolve(self, schema):
+        loader = jsonschema2popo.JsonSchema2Popo(language="python")
+        loader.process(schema)
+        return loader.definitions_index
+
+    def test_pointers(self):
+        child = {"type": "object", "properties": {"X": {"type": "integer"}}}
+        index = self.resolve(
+            {
+                "title": "Root",
+                "type": "object",
+                "properties": {
+                    "Self": {"$ref": "#"},
+                    "Sibling": {"$ref": "#/properties/Nested"},
+                    "Nested": child,
+                },
+                "$defs": {
+                    "A": {
+                        "type": "object",
+                        "properties": {
+                            "Child": child,
+                            "List": {"type": "array", "items": child},
+                        },
+                    },
+                    "a/b~c": child,
+                    "Defs": {"$ref": "#/$defs/A"},
+                    "Properties": {"$ref": "#/$defs/A/properties/Child"},
+                    "Items": {"$ref": "#/$defs/A/properties/List/items"},
+                    "Names": {"$ref": "#/definitions/A/Child"},
+                    "Escaped": {"$ref": "#/$defs/a~1b~0c"},
+                    "Percent": {"$ref": "#/$defs/a~1b%7E0c"},
+                },
+            }
+        )
+        self.assertIs(index["A"], index["Defs"].value)
+        self.assertIs(index["A.Child"], index["Properties"].value)
+        self.assertIs(index["A.Child"], index["Names"].value)
+        self.assertIs(index["A.List"], index["Items"].value)
+        self.assertIs(index["a/b~c"], index["Escaped"].value)
+        self.assertIs(index["a/b~c"], index["Percent"].value)
+        root = index["Root"]
+        properties = {p.name: p.definition for p in root.properties}
+        self.assertIs(root, properties["Self"].value)
+        self.assertIs(index["Root.Nested"], properties["Sibling"].value)
+
+    def test_unsupported_pointer(self):
+        with self.assertLogs("main", "WARNING") as logs:
+            index = self.resolve(
+                {
+                    "definitions": {
+                        "A": {
+                            "type": "object",
+                            "properties": {
+                                "Component": {"$ref": "#/components/schemas/X"},
+                                "Definitions": {"$ref": "#/definitions"},
+                            },
+                        }
+                    }
+                }
+            )
+        self.assertEqual(
+            [None, None], [p.definition.value for p in index["A"].properties]
+        )
+        self.assertEqual(2, len(logs.output))
+        self.assertIn("#/components/schemas/X", logs.output[0])
+        self.assertIn("#/definitions", logs.output[1])
+
+    def test_file_relative_to_schema(self):
+        with tempfile.TemporaryDirectory() as d:
+            os.mkdir(os.path.join(d, "sub"))
+            with open(os.path.join(d, "sub", "other.json"), "w") as f:
+                json.dump(
+                    {
+                        "title": "Other",
+                        "type": "object",
+                        "properties": {"Y": {"type": "integer"}},
+                        "definitions": {
+                            "B": {
+                                "type": "object",
+                                "properties": {"Z": {"$ref": "#"}},
+                            }
+                        },
+                    },
+                    f,
+                )
+            schema = os.path.join(d, "schema.json")
+            with open(schema, "w") as f:
+                json.dump(
+                    {
+                        "definitions": {
+                            "A": {"$ref": "sub/other.json#/definitions/B"},
+                            "C": {"$ref": "sub/other.json"},
+                        }
+                    },
+                    f,
+                )
+
+            loader = jsonschema2popo.JsonSchema2Popo(language="python")
+            with open(schema) as f:
+                loader.load(f)
+            index = loader.definitions_index
+            self.assertIs(index["B"], index["A"].value)
+            self.assertIs(index["Other"], index["C"].value)
+            self.assertIs(index["Other"], index["B"].properties[0].definition.value)
+            self.assertEqual(
+                [os.path.join(d, "sub", "other.json")], loader.loaded_files
+            )
+
+
+class FromDict(unittest.TestCase):
+    SCHEMA = {
+        "definitions": {
+            "Leaf": {
+                "type": "object",
+                "properties": {"V": {"type": "string", "default": "x"}},
+            },
+            "Base": {
+                "type": "object",
+                "properties": {
+                    "Id": {"type": "integer"},
+                    "Leaves": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/Leaf"},
+                    },
+                },
+            },
+            "AChild": {
+                "type": "object",
+                "extends": {"$ref": "#/definitions/Base"},
+                "properties": {
+                    "Top": {"$ref": "#/definitions/Leaf"},
+                    "Tags": {"type": "array", "items": {"type": "string"}},
+                },
+            },
+        }
+    }
+
+    def test_extends(self):
+        for use_slots in (False, True):
+            foo = generate_python(
+                self,
+                self.SCHEMA,
+                use_types=True,
+                constructor_type_check=True,
+                use_slots=use_slots,
+            )
+
+            tags = ["a"]
+            child = foo.AChild.from_dict(
+                {"Id": 1, "Leaves": [{"V": "y"}, {}], "Top": {}, "Tags": tags}
+            )
+            self.assertEqual(1, child.Id)
+            self.assertEqual(["y", "x"], [leaf.V for leaf in child.Leaves])
+            self.assertIsInstance(child.Top, foo.Leaf)
+            self.assertEqual(tags, child.Tags)
+            self.assertIsNot(tags, child.Tags)
+            self.assertIsNone(foo.AChild.from_dict({}).Top)
+            self.assertRaisesRegex(
+                TypeError,
+                "Id must be int",
+                lambda: foo.AChild.from_dict({"Id": "1"}),
+            )
+
+    def test_from_dicts(self):
+        foo = generate_python(
+            self, self.SCHEMA, use_types=True, constructor_type_check=True
+        )
+
+        consumed = []
+
+        def messages():
+            for i in range(3):
+                consumed.append(i)
+                yield {"Id": i, "Leaves": [{"V": str(i)}], "Top": {}}
+
+        # Generators are converted as they are consumed
+        children = foo.AChild.from_dicts(messages())
+        self.assertEqual([], consumed)
+        first = next(children)
+        self.assertEqual([0], consumed)
+        children = [first] + list(children)
+        self.assertEqual([0, 1, 2], [child.Id for child in children])
+        self.assertEqual(["2"], [leaf.V for leaf in children[2].Leaves])
+        self.assertIsInstance(children[0].Top, foo.Leaf)
+        self.assertRaisesRegex(
+            TypeError,
+            "Id must be int",
+            lambda: list(foo.AChild.from_dicts([{"Id": "1"}])),
+        )
+
+        # Each object is converted with its own as_dict, even when given to a base class
+        self.assertEqual(
+            [{"Id": 0, "Leaves": [{"V": "0"}], "Top": {"V": "x"}}, {"Id": 5}],
+            list(foo.Base.as_dicts([children[0], foo.Base(Id=5)])),
+        )
+
+
+class JsonMethods(unittest.TestCase):
+    SCHEMA = {
+        "definitions": {
+            "Color": {"type": "string", "enum": ["RED", "BLUE"]},
+            "Base": {
+                "type": "object",
+                "properties": {
+                    "Data": {"type": "string", "media": {"binaryEncoding": "base64"}},
+                },
+            },
+            "AItem": {
+                "type": "object",
+                "extends": {"$ref": "#/definitions/Base"},
+                "properties": {
+                    "Shade": {"$ref": "#/definitions/Color"},
+                    "Chunks": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "media": {"binaryEncoding": "base64"},
+                        },
+                    },
+                    "Children": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/Base"},
+                    },
+                },
+            },
+        }
+    }
+
+    def generate(self):
+        return generate_python(
+            self,
+            self.SCHEMA,
+            use_types=True,
+            constructor_type_check=True,
+            use_slots=True,
+            json_methods=True,
+        )
+
+    def round_trip(self, foo):
+        item = foo.AItem(
+            Data=b"\x00\xff",
+            Shade=foo.Color.BLUE,
+            Chunks=[b"a", b"b"],
+            Children=[foo.Base(Data=b"c"), foo.Base()],
+        )
+        encoded = item.to_json()
+        self.assertEqual(
+            {
+                "Data": "AP8=",
+                "Shade": "BLUE",
+                "Chunks": ["YQ==", "Yg=="],
+                "Children": [{"Data": "Yw=="}, {}],
+            },
+            json.loads(encoded),
+        )
+        decoded = foo.AItem.from_json(encoded)
+        self.assertEqual(item.as_dict(), decoded.as_dict())
+        self.assertEqual('"RED"', foo.Color.RED.to_json())
+        self.assertIs(foo.Color.RED, foo.Color.from_json('"RED"'))
+
+    def test_orjson(self):
+        self.round_trip(self.generate())
+
+    def test_stdlib(self):
+        orjson = sys.modules.get("orjson")
+        # Make importing orjson fail while the generated module is imported
+        sys.modules["orjson"] = None
+        try:
+            foo = self.generate()
+        finally:
+            if orjson is None:
+                del sys.modules["orjson"]
+            else:
+                sys.modules["orjson"] = orjson
+        self.assertEqual("json", foo._json_loads.__globals__["json"].__name__)
+        self.round_trip(foo)
+
+
+class DirectAttributes(unittest.TestCase):
+    SCHEMA = {
+        "definitions": {
+            "Leaf": {"type": "object", "properties": {"V": {"type": "string"}}},
+            "Base": {"type": "object", "properties": {"Id": {"type": "integer"}}},
+            "AChild": {
+                "type": "object",
+                "extends": {"$ref": "#/definitions/Base"},
+                "properties": {
+                    "Leaves": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/Leaf"},
+                    },
+                },
+            },
+        }
+    }
+
+    def test_direct_attributes(self):
+        foo = generate_python(
+            self,
+            self.SCHEMA,
+            use_types=True,
+            constructor_type_check=True,
+            direct_attributes=True,
+        )
+
+        self.assertNotIsInstance(foo.AChild.__dict__.get("Leaves"), property)
+        self.assertEqual(["Leaves"], foo.AChild.__slots__)
+
+        child = foo.AChild(Id=1, Leaves=[foo.Leaf(V="a")])
+        self.assertFalse(hasattr(child, "__dict__"))
+        self.assertRaises(AttributeError, lambda: setattr(child, "Other", 1))
+        self.assertEqual(
+            "<Class AChild. Id: 1, Leaves: [<Class Leaf. V: 'a'>]>", repr(child)
+        )
+
+        child = foo.AChild.from_dict({"Id": 2, "Leaves": [{"V": "b"}]})
+        self.assertEqual(2, child.Id)
+        self.assertEqual("b", child.Leaves[0].V)
+        self.assertEqual({"Id": 2, "Leaves": [{"V": "b"}]}, child.as_dict())
+
+        # Types are checked at the boundary, but not when setting attributes
+        self.assertRaisesRegex(
+            TypeError, "Id must be int", lambda: foo.AChild.from_dict({"Id": "2"})
+        )
+        self.assertRaisesRegex(TypeError, "Id must be int", lambda: foo.AChild(Id="2"))
+        child.Id = "3"
+        self.assertEqual("3", child.Id)
+
+
+class NamedTuples(unittest.TestCase):
+    SCHEMA = {
+        "definitions": {
+            "Color": {"type": "string", "enum": ["RED", "BLUE"]},
+            "Leaf": {
+                "type": "object",
+                "properties": {"V": {"type": "string", "default": "x"}},
+            },
+            "Base": {"type": "object", "properties": {"Id": {"type": "integer"}}},
+            "AChild": {
+                "type": "object",
+                "extends": {"$ref": "#/definitions/Base"},
+                "properties": {
+                    "Leaves": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/Leaf"},
+                    },
+                    "Tags": {"type": "array", "items": {"type": "string"}},
+                    "Shade": {"$ref": "#/definitions/Color"},
+                    "Inner": {
+                        "type": "object",
+                        "properties": {"X": {"type": "integer"}},
+                    },
+                },
+            },
+        }
+    }
+
+    def test_named_tuples(self):
+        foo = generate_python(self, self.SCHEMA, named_tuples=True)
+
+        data = {
+            "Id": 1,
+            "Leaves": [{"V": "y"}, {}],
+            "Tags": ["a", "b"],
+            "Shade": "RED",
+            "Inner": {"X": 2},
+        }
+        child = foo.AChild.from_dict(data)
+        self.assertIsInstance(child, tuple)
+        self.assertEqual(("Id", "Leaves", "Tags", "Shade", "Inner"), child._fields)
+        self.assertEqual(1, child.Id)
+        self.assertEqual((foo.Leaf(V="y"), foo.Leaf()), child.Leaves)
+        self.assertEqual(("a", "b"), child.Tags)
+        self.assertIs(foo.Color.RED, child.Shade)
+        self.assertEqual(foo.AChild._Inner(X=2), child.Inner)
+        self.assertEqual(dict(data, Leaves=[{"V": "y"}, {"V": "x"}]), child.as_dict())
+        self.assertEqual(hash(foo.AChild.from_dict(data)), hash(child))
+        self.assertRaises(AttributeError, lambda: setattr(child, "Id", 2))
+        self.assertRaises(AttributeError, lambda: setattr(child, "Other", 2))
+
+        empty = foo.AChild.from_dict({})
+        self.assertEqual(foo.AChild(), empty)
+        self.assertEqual({}, empty.as_dict())
+        self.assertEqual(
+            [1, 2], [c.Id for c in foo.AChild.from_dicts([{"Id": 1}, {"Id": 2}])]
+        )
+
+
+class LazyDecoding(unittest.TestCase):
+    SCHEMA = {
+        "definitions": {
+            "Leaf": {
+                "type": "object",
+                "properties": {"V": {"type": "string", "default": "x"}},
+            },
+            "Tree": {
+                "type": "object",
+                "properties": {
+                    "Id": {"type": "integer"},
+                    "Leaves": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/Leaf"},
+                    },
+                    "Top": {"$ref": "#/definitions/Leaf"},
+                },
+            },
+        }
+    }
+
+    def test_lazy_decoding(self):
+        for use_slots in (False, True):
+            foo = generate_python(
+                self,
+                self.SCHEMA,
+                use_types=True,
+                constructor_type_check=True,
+                use_slots=use_slots,
+                lazy_decoding=True,
+            )
+
+            data = {"Id": 1, "Leaves": [{"V": "y"}, {}], "Top": {}}
+            tree = foo.Tree.from_dict(data)
+            # Nothing has been read, so the data is passed through as it is
+            self.assertIs(data["Leaves"], tree.as_dict()["Leaves"])
+            self.assertIs(data["Top"], tree.as_dict()["Top"])
+
+            leaves = tree.Leaves
+            self.assertEqual(["y", "x"], [leaf.V for leaf in leaves])
+            self.assertIs(leaves, tree.Leaves)
+            self.assertEqual([{"V": "y"}, {"V": "x"}], tree.as_dict()["Leaves"])
+            self.assertIs(data["Top"], tree.as_dict()["Top"])
+            self.assertIsInstance(tree.Top, foo.Leaf)
+            self.assertEqual({"V": "x"}, tree.as_dict()["Top"])
+
+            tree = foo.Tree.from_dict(data)
+            tree.Top = foo.Leaf(V="z")
+            self.assertEqual({"V": "z"}, tree.as_dict()["Top"])
+            self.assertIsNone(foo.Tree.from_dict({}).Top)
+            self.assertEqual(
+                ["y"],
+                [
+                    t.Leaves[0].V
+                    for t in foo.Tree.from_dicts([{"Leaves": [{"V": "y"}]}])
+                ],
+            )
+
+
+class Validation(unittest.TestCase):
+    SCHEMA = {
+        "definitions": {
+            "Leaf": {
+                "type": "object",
+                "required": ["Code"],
+                "properties": {
+                    "Code": {
+                        "type": "string",
+                        "pattern": "^[a-z]+\\d'$",
+                        "maxLength": 4,
+                    }
+                },
+            },
+            "Tree": {
+                "type": "object",
+                "properties": {
+                    "Id": {"type": "integer", "minimum": 1, "maximum": 10},
+                    "Weight": {"type": "number", "minimum": 0},
+                    "Leaves": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/Leaf"},
+                        "minItems": 1,
+                        "maxItems": 2,
+                    },
+                    "Tags": {
+                        "type": "array",
+                        "items": {"type": "string", "minLength": 2},
+                    },
+                },
+            },
+        }
+    }
+
+    def test_validation(self):
+        for named_tuples in (False, True):
+            foo = generate_python(
+                self,
+                self.SCHEMA,
+                use_types=True,
+                validation=True,
+                named_tuples=named_tuples,
+            )
+
+            valid = {"Id": 1, "Weight": 2, "Leaves": [{"Code": "ab1'"}], "Tags": ["ab"]}
+            foo.Tree.from_dict(valid, validate=True)
+            foo.Tree.from_dict({}, validate=True)
+            # Not validated unless asked to
+            foo.Tree.from_dict(dict(valid, Id=0))
+
+            for data, error, message in (
+                (dict(valid, Id=0), ValueError, "Id must be at least 1"),
+                (dict(valid, Id=11), ValueError, "Id must be at most 10"),
+                (dict(valid, Id="1"), TypeError, "Id must be int"),
+                (dict(valid, Id=True), TypeError, "Id must be int"),
+                (dict(valid, Weight=False), TypeError, "Weight must be float"),
+                (dict(valid, Weight=-0.5), ValueError, "Weight must be at least 0"),
+                (dict(valid, Leaves=[]), ValueError, "Leaves must have at least 1"),
+                (
+                    dict(valid, Leaves=[{}] * 3),
+                    ValueError,
+                    "Leaves must have at most 2",
+                ),
+                (dict(valid, Leaves=[{}]), ValueError, "Code is required"),
+                (
+                    dict(valid, Leaves=[{"Code": "abc1'"}]),
+                    ValueError,
+                    "Code must be at most 4 characters",
+                ),
+                (dict(valid, Leaves=[{"Code": "ab'"}]), ValueError, "Code must match"),
+                (
+                    dict(valid, Tags=["a"]),
+                    ValueError,
+                    "Tags list values must be at least",
+                ),
+            ):
+                self.assertRaisesRegex(
+                    error, message, lambda: foo.Tree.from_dict(data, validate=True)
+                )
+                self.assertRaisesRegex(
+                    error, message, lambda: foo.Tree.from_dict(data).validate()
+                )
+
+
+class EnumLookup(unittest.TestCase):
+    SCHEMA = {
+        "definitions": {
+            "Level": {"type": "integer", "enum": [1, 2]},
+            "Size": {
+                "type": "string",
+                "enum": ["s", "m"],
+                "javaEnumNames": ["SMALL", "MEDIUM"],
+            },
+            "Shirt": {
+                "type": "object",
+                "properties": {
+                    "Level": {"$ref": "#/definitions/Level"},
+                    "Sizes": {"type": "array", "items": {"$ref": "#/definitions/Size"}},
+                },
+            },
+        }
+    }
+
+    def test_enum_lookup(self):
+        for enum_mixins in (False, True):
+            foo = generate_python(
+                self, self.SCHEMA, use_types=True, enum_mixins=enum_mixins
+            )
+
+            data = {"Level": 2, "Sizes": ["m", "s"]}
+            shirt = foo.Shirt.from_dict(data)
+            self.assertIs(shirt.Level, foo.Level.VALUE_2)
+            self.assertEqual(shirt.Sizes, [foo.Size.MEDIUM, foo.Size.SMALL])
+            self.assertIs(foo.Size.from_dict("s"), foo.Size.SMALL)
+            self.assertEqual(shirt.as_dict(), data)
+            self.assertEqual(json.dumps(shirt.as_dict()), json.dumps(data))
+            self.assertEqual(issubclass(foo.Level, int), enum_mixins)
+            self.assertEqual(issubclass(foo.Size, str), enum_mixins)
+            self.assertRaisesRegex(
+                ValueError,
+                "3 is not a valid Level",
+                lambda: foo.Shirt.from_dict({"Level": 3}),
+            )
+            self.assertRaisesRegex(
+                ValueError, "'l' is not a valid Size", lambda: foo.Size.from_dict("l")
+            )
+            # Unhashable values fail in the same way through the table as through the enum
+            self.assertRaisesRegex(
+                ValueError,
+                r"\[1\] is not a valid Level",
+                lambda: foo.Shirt.from_dict({"Level": [1]}),
+            )
+            self.assertRaisesRegex(
+                ValueError,
+                r"\{\} is not a valid Size",
+                lambda: foo.Shirt.from_dict({"Sizes": [{}]}),
+            )
+
+    def test_number_enum_mixins(self):
+        schema = {
+            "definitions": {
+                "Ratio": {"type": "number", "enum": [0.5, 1.5]},
+                "Count": {"type": "number", "enum": [1, 2.5]},
+                "Box": {
+                    "type": "object",
+                    "properties": {
+                        "Ratio": {"$ref": "#/definitions/Ratio"},
+                        "Count": {"$ref": "#/definitions/Count"},
+                    },
+                },
+            }
+        }
+        foo = generate_python(self, schema, use_types=True, enum_mixins=True)
+
+        self.assertTrue(issubclass(foo.Ratio, float))
+        # A float mixin would turn 1 into 1.0, so an enum with integer values stays a plain enum
+        self.assertFalse(issubclass(foo.Count, float))
+        data = {"Ratio": 1.5, "Count": 1}
+        box = foo.Box.from_dict(data)
+        self.assertEqual(json.dumps(box.as_dict()), json.dumps(data))
+        self.assertEqual(type(box.as_dict()["Count"]), int)
+
+
+class ModulePerDefinition(unittest.TestCase):
+    run_main = Batch.run_main
+
+    SCHEMA = {
+        "definitions": {
+            "Status": {"type": "string", "enum": ["OPEN", "PAID"]},
+            "Base": {"type": "object", "properties": {"Id": {"type": "integer"}}},
+            "LineItem": {
+                "type": "object",
+                "properties": {"Status": {"$ref": "#/definitions/Status"}},
+            },
+            "Order": {
+                "type": "object",
+                "extends": {"$ref": "#/definitions/Base"},
+                "properties": {
+                    "Items": {
+                        "type": "array",
+                        "items": {"$ref": "#/definitions/LineItem"},
+                    }
+                },
+            },
+        }
+    }
+
+    def test_module_per_definition(self):
+        with tempfile.TemporaryDirectory() as d:
+            schema = os.path.join(d, "schema.json")
+            output = os.path.join(d, "generated_models")
+            with open(schema, "w") as f:
+                json.dump(self.SCHEMA, f)
+            self.run_main("-t", "--module-per-definition", "-o", output, schema)
+            self.assertEqual(
+                [
+                    "__init__.py",
+                    "_helpers.py",
+                    "base.py",
+                    "line_item.py",
+                    "order.py",
+                    "root_object.py",
+                    "status.py",
+                ],
+                sorted(os.listdir(output)),
+            )
+            mypy_check(
+                self,
+                *(
+                    mypy.main.BuildSource(
+                        path=os.path.join(output, f),
+                        module="generated_models"
+                        + ("" if f == "__init__.py" else "." + f[: -len(".py")]),
+                        base_dir=d,
+                    )
+                    for f in sorted(os.listdir(output))
+                ),
+            )
+
+            def imported():
+                return sorted(m for m in sys.modules if m.startswith(package + "."))
+
+            package = "generated_models"
+            sys.path.insert(0, d)
+            importlib.invalidate_caches()
+            try:
+                models = importlib.import_module(package)
+                self.assertEqual([], imported())
+                item = models.LineItem.from_dict({"Status": "PAID"})
+                self.assertIs(item.Status, models.Status.PAID)
+                self.assertEqual(
+                    [
+                        package + "._helpers",
+                        package + ".line_item",
+                        package + ".status",
+                    ],
+                    imported(),
+                )
+
+                data = {"Id": 1, "Items": [{"Status": "OPEN"}]}
+                order = models.Order.from_dict(data)
+                self.assertIsInstance(order, models.Base)
+                self.assertEqual(data, order.as_dict())
+                self.assertIn("Order", dir(models))
+                self.assertRaises(AttributeError, lambda: models.Missing)
+            finally:
+                sys.path.remove(d)
+                for name in [package] + imported():
+                    del sys.modules[name]
+
+            # Modules of removed definitions are deleted, but not files which weren't generated
+            with open(os.path.join(output, "extra.py"), "w") as f:
+                f.write("")
+            schema_without_order = {
+                "definitions": {
+                    k: v for k, v in self.SCHEMA["definitions"].items() if k != "Order"
+                }
+            }
+            with open(schema, "w") as f:
+                json.dump(schema_without_order, f)
+            self.run_main("-t", "--module-per-definition", "-o", output, schema)
+            self.assertEqual(
+                [
+                    "__init__.py",
+                    "_helpers.py",
+                    "base.py",
+                    "extra.py",
+                    "line_item.py",
+                    "root_object.py",
+                    "status.py",
+                ],
+                sorted(f for f in os.listdir(output) if f.endswith(".py")),
+            )
+
+    def test_alias(self):
+        schema_data = {
+            "definitions": {
+                "Alias": {"$ref": "#/definitions/Order"},
+                "Order": {
+                    "type": "object",
+                    "properties": {"Status": {"type": "string", "enum": ["OPEN"]}},
+                },
+            }
+        }
+        with tempfile.TemporaryDirectory() as d:
+            schema = os.path.join(d, "schema.json")
+            package = "alias_models"
+            with open(schema, "w") as f:
+                json.dump(schema_data, f)
+            self.run_main(
+                "-t", "--module-per-definition", "-o", os.path.join(d, package), schema
+            )
+            sys.path.insert(0, d)
+            importlib.invalidate_caches()
+            try:
+                models = importlib.import_module(package)
+                alias = models.Alias.from_dict({"Status": "OPEN"})
+                self.assertEqual("OPEN", alias.Status.value)
+                self.assertEqual({"Status": "OPEN"}, alias.as_dict())
+            finally:
+                sys.path.remove(d)
+                for name in list(sys.modules):
+                    if name == package or name.startswith(package + "."):
+                        del sys.modules[name]
+
+
+class Base64Bytes(unittest.TestCase):
+    SCHEMA = {
+        "definitions": {
+            "Attachment": {
+                "type": "object",
+                "properties": {
+                    "Data": {"type": "string", "media": {"binaryEncoding": "base64"}},
+                    "Chunks": {
+                        "type": "array",
+                        "items": {
+                            "type": "string",
+                            "media": {"binaryEncoding": "base64"},
+                        },
+                    },
+                },
+            }
+        }
+    }
+
+    def test_base64_bytes(self):
+        for style in ("use_slots", "direct_attributes", "named_tuples"):
+            foo = generate_python(
+                self,
+                self.SCHEMA,
+                use_types=True,
+                base64_bytes=True,
+                constructor_type_check=True,
+                **{style: True},
+            )
+
+            data = {"Data": "AAFoaQ==", "Chunks": ["aGk=", "dGhlcmU="]}
+            attachment = foo.Attachment.from_dict(data)
+            self.assertEqual(attachment.as_dict(), data)
+            self.assertEqual(attachment.Data, b"\x00\x01hi")
+            self.assertEqual(list(attachment.Chunks), [b"hi", b"there"])
+            self.assertEqual(attachment.as_dict(), data)
+
+            view = memoryview(b"\x00\x01hi")
+            chunk = bytearray(b"hi")
+            chunks = (chunk,) if style == "named_tuples" else [chunk]
+            attachment = foo.Attachment(Data=view, Chunks=chunks)
+            self.assertIs(attachment.Data, view)
+            self.assertIs(attachment.Chunks[0], chunk)
+            self.assertEqual(
+                attachment.as_dict(), {"Data": "AAFoaQ==", "Chunks": ["aGk="]}
+            )
+
+
 if __name__ == "__main__":
     unittest.main()